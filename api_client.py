@@ -1,16 +1,39 @@
 #api_client.py
 import os
+import json
+import time
+import base64
+import binascii
 import pickle
+import threading
 import requests
 from dotenv import load_dotenv
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Union
+from transport import new_session, retry_after
 
 load_dotenv()
 
+# Refresh the AuthenticationToken this many seconds before it expires.
+TOKEN_REFRESH_MARGIN = float(os.getenv("TOKEN_REFRESH_MARGIN", 120))
+
 class AdbrazeClient:
     def __init__(self):
-        self.session = requests.Session()
+        self.session = new_session()
         self.etag = None
+        # Token refresh: one at a time, each bumping the generation so callers
+        # that waited on it reuse its result. None disables refreshing ahead of expiry.
+        self.refresh_margin: Optional[float] = TOKEN_REFRESH_MARGIN
+        self._auth_lock = threading.Lock()
+        self._auth_generation = 0
+        self._auth_ok = True
+        self._timer: Optional[threading.Timer] = None
+        self._timer_lock = threading.Lock()
+        self.refreshes = 0
+        self.unauthorized = 0
+        # Outcome of the last get_tasks call, for the poll scheduler.
+        self.last_status: Optional[int] = None
+        self.last_bytes = 0
+        self.retry_after: Optional[float] = None
         self.email = os.getenv("EMAIL")
         self.password = os.getenv("PASSWORD")
         self.user_id = os.getenv("USERID")
@@ -36,6 +59,7 @@ class AdbrazeClient:
                     if self._validate_cookies(cookies):
                         self.session.cookies = cookies
                         print("✅ Loaded valid cookies")
+                        self._schedule_refresh()
                         return
             except Exception as e:
                 print(f"⚠️ Cookie load failed: {str(e)}")
@@ -53,11 +77,13 @@ class AdbrazeClient:
         if self._validate_cookies(self.session.cookies):
             with open("cookies.pkl", "wb") as f:
                 pickle.dump(self.session.cookies, f)
+            self._schedule_refresh()
         else:
             self._clear_auth()
 
     def _clear_auth(self):
         """Reset authentication state"""
+        self._cancel_refresh()
         self.session.cookies.clear()
         self.user_id = None
         if os.path.exists("cookies.pkl"):
@@ -129,21 +155,109 @@ class AdbrazeClient:
             print(f"🚨 Refresh error: {str(e)}")
             return False
 
-    def get_tasks(self) -> Optional[Dict[str, Any]]:
-        """Robust task fetching with retry logic"""
+    def _auth_token(self):
+        """The AuthenticationToken cookie; refreshes can leave several, and the last one set wins."""
+        token = None
+        for cookie in self.session.cookies:
+            if cookie.name == "AuthenticationToken":
+                token = cookie
+        return token
+
+    def token_expiry(self) -> Optional[float]:
+        """Epoch seconds the AuthenticationToken expires at: its JWT exp claim, else the cookie's expiry."""
+        token = self._auth_token()
+        if token is None:
+            return None
+        exp = _jwt_claims(token.value).get("exp")
+        return float(exp) if isinstance(exp, (int, float)) else token.expires
+
+    def _refresh_due(self) -> Optional[float]:
+        """When to refresh: refresh_margin before expiry, or a quarter of the lifetime for tokens shorter than that."""
+        expiry = self.token_expiry()
+        if expiry is None or self.refresh_margin is None:
+            return None
+        margin = self.refresh_margin
+        issued = _jwt_claims(self._auth_token().value).get("iat")
+        if isinstance(issued, (int, float)):
+            margin = min(margin, (expiry - issued) / 4)
+        return expiry - margin
+
+    def _schedule_refresh(self):
+        """(Re)start the background timer that refreshes the token before it expires."""
+        due = self._refresh_due()
+        with self._timer_lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            if due is None:
+                return
+            self._timer = threading.Timer(max(due - time.time(), 1.0), self._background_refresh)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _cancel_refresh(self):
+        with self._timer_lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+
+    def _background_refresh(self):
+        generation = self._auth_generation
+        due = self._refresh_due()
+        if due is not None and due > time.time():
+            # Someone refreshed since the timer was set.
+            self._schedule_refresh()
+            return
+        self._refresh_auth(generation)
+
+    def _refresh_auth(self, generation: int) -> bool:
+        """
+        Refresh the token, falling back to a full login, unless another thread
+        already did since `generation` was read. Concurrent callers wait for
+        the one refresh in flight and share its result.
+        """
+        with self._auth_lock:
+            if self._auth_generation != generation:
+                return self._auth_ok
+            self.refreshes += 1
+            self._auth_ok = self.refresh_token() or self.login()
+            self._auth_generation += 1
+            return self._auth_ok
+
+    def ensure_token(self) -> bool:
+        """Refresh now if the token is already due (e.g. the timer missed it while the machine slept)."""
+        generation = self._auth_generation
+        due = self._refresh_due()
+        if due is None or due > time.time():
+            return True
+        return self._refresh_auth(generation)
+
+    def close(self):
+        """Stop the background refresh timer."""
+        self._cancel_refresh()
+
+    def get_tasks(self, raw: bool = False) -> Optional[Union[Dict[str, Any], bytes]]:
+        """Robust task fetching with retry logic. With raw=True the undecoded response body is returned."""
+        self.last_status = None
+        self.last_bytes = 0
+        self.retry_after = None
+        self.ensure_token()
         for attempt in range(3):
             try:
+                generation = self._auth_generation
                 response = self.session.get(
                     f"{self.base_url}/task-manager",
                     headers={"If-None-Match": self.etag} if self.etag else None,
                     timeout=15
                 )
+                self.last_status = response.status_code
+                self.last_bytes += int(response.headers.get("Content-Length") or len(response.content))
+                self.retry_after = retry_after(response)
                 
                 if response.status_code == 401 and attempt < 2:
+                    self.unauthorized += 1
                     print("🔑 Attempting token refresh...")
-                    if self.refresh_token():
-                        continue
-                    if self.login():
+                    if self._refresh_auth(generation):
                         continue
                         
                 response.raise_for_status()
@@ -153,7 +267,7 @@ class AdbrazeClient:
                     return None
                     
                 self.etag = response.headers.get("ETag")
-                return response.json()
+                return response.content if raw else response.json()
                 
             except requests.HTTPError as e:
                 print(f"🔴 HTTP error: {e.response.status_code} {e.response.text}")
@@ -164,4 +278,17 @@ class AdbrazeClient:
                 print(f"🔴 Network error: {str(e)}")
                 break
                 
-        return None
\ No newline at end of file
+        return None
+
+
+def _jwt_claims(token: str) -> Dict[str, Any]:
+    """The payload of a JWT, without verifying it; {} for anything that isn't one."""
+    parts = token.split(".")
+    if len(parts) != 3:
+        return {}
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(parts[1] + "=" * (-len(parts[1]) % 4)))
+    except (binascii.Error, ValueError):
+        return {}
+    return claims if isinstance(claims, dict) else {}
+
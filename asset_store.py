@@ -0,0 +1,179 @@
+# asset_store.py
+import os
+import stat
+import time
+import errno
+import shutil
+import hashlib
+import platform
+import tempfile
+import subprocess
+from typing import NamedTuple, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# How long a URL alias is served from the store before the URL is asked again (with its ETag, if any).
+ASSET_URL_TTL = int(os.getenv("ASSET_URL_TTL", 24 * 3600))
+# Stored objects are read-only (and so are task files hardlinked to them). Not on Windows,
+# which can't rename a fresh download over a read-only file.
+STORED_MODE = 0o444
+# ioctl that makes a file share another's blocks (Linux, from <linux/fs.h>).
+FICLONE = 0x40049409
+
+
+class UrlAlias(NamedTuple):
+    key: str
+    filename: str
+    etag: Optional[str]  # validator sent back as If-None-Match when the alias is revalidated
+    fresh: bool  # recorded less than url_ttl seconds ago
+
+
+class AssetStore:
+    """
+    Content-addressed store that task folders clone into, so an asset shared
+    by several tasks is downloaded and stored on disk once.
+
+    Objects live at <root>/<kind>/<ab>/<value> for a key "<kind>-<value>":
+    "md5-..." for Drive files, "drive-..." for exported Google Docs items and
+    "sha256-..." for reference downloads. Where the filesystem supports it
+    (Btrfs, XFS, APFS) task files are reflinks: they share blocks with the
+    store but not the inode, so editing one can't change the stored object.
+    Elsewhere they are hardlinks. Stored objects are read-only on POSIX, so
+    an edit in place through a hardlink fails instead of corrupting every
+    task that uses it. Task folders replace assets (as every downloader here
+    does, via a part file and rename).
+    """
+
+    def __init__(self, root: str, url_ttl: int = ASSET_URL_TTL):
+        self.root = root
+        self.url_ttl = url_ttl
+        os.makedirs(root, exist_ok=True)
+
+    def path_for(self, key: str) -> str:
+        kind, _, value = key.partition("-")
+        return os.path.join(self.root, kind, value[:2], value)
+
+    def has(self, key: str) -> bool:
+        return os.path.exists(self.path_for(key))
+
+    def link_into(self, key: str, dest: str) -> bool:
+        """Materialise a stored object at dest. Returns False if the store does not have it."""
+        src = self.path_for(key)
+        if not os.path.exists(src):
+            return False
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        tmp = f"{dest}.link"
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        _clone(src, tmp)
+        os.replace(tmp, dest)
+        return True
+
+    def ingest(self, path: str, key: str) -> None:
+        """
+        Add a freshly downloaded file to the store. If the store already holds
+        the same content, path is replaced with a link to the stored copy.
+        """
+        stored = self.path_for(key)
+        if os.path.exists(stored):
+            if not os.path.samefile(path, stored):
+                self.link_into(key, path)
+            return
+        os.makedirs(os.path.dirname(stored), exist_ok=True)
+        tmp = f"{stored}.tmp{os.getpid()}"
+        _clone(path, tmp)
+        if os.name == "posix":
+            os.chmod(tmp, STORED_MODE)
+        os.replace(tmp, stored)
+
+    # URL aliases let reference downloads be served from the store before any request is made,
+    # until they are url_ttl old; then the URL is revalidated (see helpers._download_link).
+
+    def _alias_path(self, url: str) -> str:
+        return os.path.join(self.root, "url", hashlib.sha256(url.encode("utf-8")).hexdigest())
+
+    def lookup_url(self, url: str) -> Optional[UrlAlias]:
+        """Return the alias recorded for a download URL, if its content is still stored."""
+        try:
+            with open(self._alias_path(url), "r", encoding="utf-8") as f:
+                fields = f.read().split("\t", 3)
+        except OSError:
+            return None
+        if len(fields) == 4:
+            key, recorded, etag, filename = fields
+        elif len(fields) == 2:
+            # Written before aliases expired: no ETag, and revalidated on first use.
+            (key, filename), recorded, etag = fields, 0, ""
+        else:
+            return None
+        if not self.has(key):
+            return None
+        try:
+            fresh = time.time() - float(recorded) < self.url_ttl
+        except ValueError:
+            fresh = False
+        return UrlAlias(key, filename, etag or None, fresh)
+
+    def remember_url(self, url: str, key: str, filename: str, etag: Optional[str] = None) -> None:
+        """Record (or re-stamp, after a revalidation) which stored object a download URL gave."""
+        alias = self._alias_path(url)
+        os.makedirs(os.path.dirname(alias), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".alias.", dir=os.path.dirname(alias))
+        with open(fd, "w", encoding="utf-8") as f:
+            f.write(f"{key}\t{time.time()}\t{etag or ''}\t{filename}")
+        os.replace(tmp, alias)
+
+
+def _clone(src: str, dest: str) -> None:
+    """
+    Reflink src to dest, falling back to a hardlink and finally a plain copy.
+    A reflink or copy is writable even when src is a read-only stored object.
+    """
+    if _reflink(src, dest):
+        return
+    try:
+        os.link(src, dest)
+        return
+    except OSError:
+        pass
+    shutil.copyfile(src, dest)
+
+
+def _reflink(src: str, dest: str) -> bool:
+    """Copy-on-write clone of src at dest: FICLONE on Linux, clonefile (cp -c) on macOS."""
+    system = platform.system()
+    if system == "Darwin":
+        if subprocess.run(["cp", "-c", src, dest], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode:
+            return False
+        os.chmod(dest, os.stat(dest).st_mode | stat.S_IWUSR)
+        return True
+    if system != "Linux":
+        return False
+    import fcntl
+    with open(src, "rb") as source, open(dest, "xb") as target:
+        try:
+            fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+            return True
+        except OSError as e:
+            # Not supported here (e.g. ext4, or across filesystems): leave dest to the fallbacks.
+            if e.errno not in (errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.EBADF):
+                raise
+    os.remove(dest)
+    return False
+
+
+def default_store() -> Optional[AssetStore]:
+    """
+    The store configured by ASSET_STORE, defaulting to <TASKFOLDERPASS>/.assets.
+    Set ASSET_STORE=off to disable it.
+    """
+    root = os.getenv("ASSET_STORE")
+    if root and root.lower() == "off":
+        return None
+    if not root:
+        base = os.getenv("TASKFOLDERPASS")
+        if not base:
+            return None
+        root = os.path.join(base, ".assets")
+    return AssetStore(root)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+"""
+creative_names throughput on names.txt scaled up: parse_name rate, index
+build time and query latency for CreativeIndex.query.
+
+    python benchmarks/bench_creative_names.py --names 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from creative_names import CreativeIndex, parse_name
+
+QUERIES = [
+    {"format": "Video", "de": "AH", "co": 44},
+    {"cm": "VT"},
+    {"format": "Static", "hook_designer": "IK", "p": 20},
+    {"de": "ZZ"},
+]
+
+
+def scaled_corpus(lines, count):
+    """Repeat the corpus, making every copy distinct by tweaking the N- title."""
+    names = []
+    copy = 0
+    while len(names) < count:
+        for line in lines:
+            names.append(line.replace("_N-", f"_N-v{copy}-", 1) if copy else line)
+            if len(names) == count:
+                break
+        copy += 1
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--names", type=int, default=1000000)
+    args = parser.parse_args()
+
+    with open(os.path.join(ROOT, "names.txt"), encoding="utf-8") as f:
+        lines = [line.strip() for line in f if line.strip()]
+    names = scaled_corpus(lines, args.names)
+
+    start = time.perf_counter()
+    for name in names:
+        parse_name(name)
+    parse_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = CreativeIndex(names)
+    build_time = time.perf_counter() - start
+
+    print(f"{len(names)} names ({index.skipped} not parsed)")
+    print(f"parse_name     {len(names) / parse_time / 1000:8.0f}k names/s")
+    print(f"index build    {build_time:8.1f} s")
+    for criteria in QUERIES:
+        start = time.perf_counter()
+        matches = index.query(**criteria)
+        elapsed = time.perf_counter() - start
+        scan_start = time.perf_counter()
+        scanned = [r for r in index.records if all(getattr(r, k, None) == v for k, v in criteria.items()
+                                                    if k != "hook_designer")
+                   and ("hook_designer" not in criteria or (r.hook or "").split("-")[0] == criteria["hook_designer"])]
+        scan = time.perf_counter() - scan_start
+        assert scanned == matches
+        print(f"query {criteria}: {len(matches)} matches in {elapsed * 1000:.2f} ms (full scan {scan * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""
+Poll ingestion when only a few tasks change between polls: a full
+TaskStore.load_payload of every board against TaskStore.apply_payload,
+which validates only new or changed items and returns change events.
+
+    python benchmarks/bench_delta_ingest.py --tasks 10000 --churn 20 --polls 5
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from task_store import TaskStore
+from synthetic_tasks import STATUSES, make_board
+
+
+def polls(tasks, count, churn, seed=2):
+    """Yield `count` raw boards, each with `churn` tasks moved to another status."""
+    rng = random.Random(seed)
+    for i in range(count):
+        for task in rng.sample(tasks, churn):
+            task["status"] = rng.choice(STATUSES)
+            task["statusChangeTime"] = f"2025-03-02T00:{i:02d}:00Z"
+        yield json.dumps(tasks, ensure_ascii=False).encode("utf-8")
+
+
+def run(ingest, boards):
+    elapsed = []
+    for board in boards:
+        start = time.perf_counter()
+        ingest(board)
+        elapsed.append(time.perf_counter() - start)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--churn", type=int, default=20, help="Tasks changed per poll.")
+    parser.add_argument("--polls", type=int, default=5)
+    args = parser.parse_args()
+
+    tasks, _ = make_board(args.tasks)
+    first = json.dumps(tasks, ensure_ascii=False).encode("utf-8")
+    boards = list(polls(tasks, args.polls, args.churn))
+
+    full = TaskStore(compact=True)
+    full.load_payload(first)
+    full_times = run(full.load_payload, boards)
+
+    delta = TaskStore(compact=True)
+    delta.apply_payload(first)
+    events = []
+    delta_times = run(lambda board: events.append(delta.apply_payload(board)), boards)
+    assert delta.tasks == full.tasks
+
+    full_ms = sum(full_times) / len(full_times) * 1000
+    delta_ms = sum(delta_times) / len(delta_times) * 1000
+    print(f"{args.tasks} tasks, {args.churn} changed per poll, {args.polls} polls")
+    print(f"load_payload   {full_ms:8.0f} ms/poll")
+    print(f"apply_payload  {delta_ms:8.0f} ms/poll  ({full_ms / delta_ms:.1f}x), "
+          f"{sum(map(len, events)) / len(events):.0f} events/poll")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""
+Compare description_parser.parse_description with the three passes
+setup_new_task used to make over a description: BeautifulSoup for the text
+(description_extractor), BeautifulSoup again for the <a href> values
+(download_href_links) and the folder-name scan (extract_download_links).
+
+1. Equivalence: synthetic descriptions plus random tag soup (nested and
+   unclosed tags, entities, comments, <pre>, <script>) must give the same
+   text, hrefs and names as the triple pass.
+2. Throughput on large, image-heavy descriptions.
+3. Unterminated tags ("<a " * n), which must stay linear.
+
+    python benchmarks/bench_description_parse.py --images 200 --repeat 5
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bs4 import BeautifulSoup
+from description_parser import parse_description
+from download_links import extract_download_links
+from synthetic_tasks import make_description
+
+SOUP_PIECES = [
+    "<p>", "</p>", "<a href=\"https://x/1\">", "<a href='https://x/2?a=1&amp;b=2'>", "</a>", "<b>", "</b>",
+    "<br>", "<br/>", "<img src=\"https://cdn/x.png\">", "<pre>", "</pre>", "<script>", "</script>",
+    "<!-- note -->", "&amp;", "&lt;", "&nbsp;", "&#150;", "&#x41;", "&bogus;", " ", "\n", "  \n ",
+    "hook", "CTA text", "09.01.2025 F-Video_N-x_Co-46_De-LG", "<div>", "</div>", "<span>", "</span>",
+    "<ul><li>", "</li></ul>", "<b ", "<p", "</p", "<!--",
+]
+
+
+def triple_pass(description):
+    soup = BeautifulSoup(description, "html.parser")
+    for a in soup.find_all("a"):
+        a.replace_with(f"{a.text} ({a['href']})")
+    text = soup.get_text(separator="\n", strip=True)
+    hrefs = [a["href"] for a in BeautifulSoup(description, "html.parser").find_all("a", href=True)]
+    return text, hrefs, extract_download_links(description)
+
+
+def tag_soup(rng):
+    return "".join(rng.choice(SOUP_PIECES) for _ in range(rng.randint(5, 60)))
+
+
+def check_equivalence(count, seed):
+    rng = random.Random(seed)
+    for i in range(count):
+        if i % 2:
+            description = make_description(rng, images=rng.randint(0, 30), links=rng.randint(0, 8))
+        else:
+            description = tag_soup(rng)
+        expected = triple_pass(description)
+        got = tuple(parse_description(description))
+        assert got == expected, f"mismatch on {description!r}:\n{got}\n!=\n{expected}"
+    return count
+
+
+def timed(fn, descriptions, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for description in descriptions:
+            fn(description)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fuzz", type=int, default=2000, help="Random descriptions to check for equivalence.")
+    parser.add_argument("--images", type=int, default=200, help="Images per benchmark description.")
+    parser.add_argument("--descriptions", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"equivalence: {check_equivalence(args.fuzz, args.seed)} descriptions, identical results")
+
+    rng = random.Random(args.seed)
+    descriptions = [make_description(rng, images=args.images, links=20, paragraphs=60)
+                    for _ in range(args.descriptions)]
+    size = sum(map(len, descriptions))
+    old = timed(triple_pass, descriptions, args.repeat)
+    new = timed(parse_description, descriptions, args.repeat)
+    per = lambda seconds: seconds / len(descriptions) * 1000
+    print(f"{len(descriptions)} descriptions, {args.images} images each ({size / 1e6:.1f} MB)")
+    print(f"  triple pass        {per(old):8.2f} ms/description")
+    print(f"  parse_description  {per(new):8.2f} ms/description  ({old / new:.1f}x)")
+
+    print(f"\nunterminated <a{'n':>8}{'ms':>10}")
+    for n in (1000, 5000, 20000):
+        elapsed = timed(parse_description, ["<a " * n], 1)
+        print(f"{'':15}{n:>8}{elapsed * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
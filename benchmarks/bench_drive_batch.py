@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""
+Drive round-trips and wall time for metadata work done one call at a time
+(the recursive per-folder listing build_manifest used to do, one search per
+name chunk, one files().get per file) against gd's batch requests, on a fake
+wide and shallow tree with --latency seconds per round-trip.
+
+    python benchmarks/bench_drive_batch.py --subfolders 40 --latency 0.05
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from googleapiclient.discovery import build
+
+import gd
+from fake_drive import FakeDrive
+
+
+def make_tree(drive, subfolders, nested, files):
+    root = drive.add_folder("09.01.2025 F-Video_N-wide_Co-40_De-AS")
+    for s in range(subfolders):
+        folder = drive.add_folder(f"scene_{s:02d}", root)
+        for n in range(nested):
+            inner = drive.add_folder(f"take_{n}", folder)
+            for i in range(files):
+                drive.add_file(f"clip_{i:02d}.mp4", inner, b"v" * 512, "video/mp4")
+        drive.add_file("notes.txt", folder, b"n", "text/plain")
+    return root
+
+
+def sequential_manifest(service, folder_id, local_path):
+    manifest = []
+    for item in gd.list_folder_contents(service, folder_id):
+        item_path = os.path.join(local_path, item["name"])
+        if item["mimeType"] == gd.FOLDER_MIME_TYPE:
+            manifest.extend(sequential_manifest(service, item["id"], item_path))
+        else:
+            manifest.append({**item, "path": item_path})
+    return manifest
+
+
+def sequential_resolve(service, names):
+    resolved = {}
+    for i in range(0, len(names), gd.NAME_QUERY_BATCH):
+        clauses = " or ".join(f"name = '{gd._quote(name)}'" for name in names[i:i + gd.NAME_QUERY_BATCH])
+        query = f"({clauses}) and mimeType = '{gd.FOLDER_MIME_TYPE}' and trashed = false"
+        for folder in service.files().list(q=query, fields="files(id, name)").execute().get("files", []):
+            resolved.setdefault(folder["name"], folder["id"])
+    return resolved
+
+
+def sequential_metadata(service, file_ids):
+    return {file_id: service.files().get(fileId=file_id).execute() for file_id in file_ids}
+
+
+def measure(drive, fn):
+    drive.requests.clear()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    trips = sum(drive.requests[kind] for kind in ("list", "get")) - drive.requests["batched"] + drive.requests["batch"]
+    return result, trips, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subfolders", type=int, default=40)
+    parser.add_argument("--nested", type=int, default=2, help="Folders inside each subfolder.")
+    parser.add_argument("--files", type=int, default=5, help="Files per nested folder.")
+    parser.add_argument("--names", type=int, default=60, help="Folder names to resolve.")
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    drive = FakeDrive(latency=args.latency)
+    root = make_tree(drive, args.subfolders, args.nested, args.files)
+    service = build("drive", "v3", http=drive.http())
+    names = [f"scene_{s:02d}" for s in range(args.names)]
+    file_ids = [file_id for file_id, meta in drive.files.items() if meta["mimeType"] == "video/mp4"][:100]
+
+    print(f"{'':24}{'round-trips':>12}{'seconds':>10}{'':>6}{'round-trips':>12}{'seconds':>10}")
+    print(f"{'':24}{'sequential':>22}{'':>6}{'batched':>22}")
+    cases = [
+        ("build_manifest", lambda: sequential_manifest(service, root, "/tmp/unused"),
+         lambda: gd.build_manifest(service, root, "/tmp/unused"),
+         lambda old, new: sorted(e["id"] for e in old) == sorted(e["id"] for e in new)),
+        (f"resolve {args.names} names", lambda: sequential_resolve(service, names),
+         lambda: gd.resolve_folder_ids(service, names), lambda old, new: old == new),
+        (f"metadata {len(file_ids)} files", lambda: sequential_metadata(service, file_ids),
+         lambda: gd.get_files_metadata(service, file_ids)[0], lambda old, new: old == new),
+    ]
+    for label, old_fn, new_fn, same in cases:
+        old, old_trips, old_time = measure(drive, old_fn)
+        new, new_trips, new_time = measure(drive, new_fn)
+        assert same(old, new), label
+        print(f"{label:<24}{old_trips:>12}{old_time:>10.2f}{'':>6}{new_trips:>12}{new_time:>10.2f}"
+              f"  ({old_time / new_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+"""
+Per-link Drive setup overhead: authenticate() + build() on every
+download_folders call (and a build per parallel worker), as gd.py used to
+do, against drive_client.DriveClientProvider. OAuth token refreshes go to a
+local stand-in for oauth2.googleapis.com that answers after --token-latency.
+
+1. Steady state: --links calls in a row with a valid token.json.
+2. Expired token with --concurrent setups starting at once, as the
+   pipeline's workers do: how many refreshes reach the token endpoint.
+
+    python benchmarks/bench_drive_client.py --links 50 --workers 4
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import google.oauth2.credentials
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build
+
+from drive_client import SCOPES, DriveClientProvider
+
+
+class TokenEndpoint(BaseHTTPRequestHandler):
+    latency = 0.15
+    refreshes = 0
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        with self.lock:
+            TokenEndpoint.refreshes += 1
+        time.sleep(self.latency)
+        body = json.dumps({"access_token": f"ya29.{time.time()}", "expires_in": 3600, "token_type": "Bearer"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def write_token(token_uri, expires_in):
+    expiry = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
+    with open("token.json", "w") as f:
+        json.dump({"token": "ya29.old", "refresh_token": "1//refresh", "token_uri": token_uri,
+                   "client_id": "bench.apps.googleusercontent.com", "client_secret": "secret", "scopes": SCOPES,
+                   "expiry": expiry.strftime("%Y-%m-%dT%H:%M:%SZ")}, f)
+
+
+def legacy_setup(workers):
+    """What download_folders did per call before the provider."""
+    creds = Credentials.from_authorized_user_file("token.json", SCOPES)
+    if not creds.valid:
+        creds.refresh(Request())
+        with open("token.json", "w") as token_file:
+            token_file.write(creds.to_json())
+    build("drive", "v3", credentials=creds)
+    if workers > 1:
+        with ThreadPoolExecutor(workers) as pool:
+            list(pool.map(lambda _: build("drive", "v3", credentials=creds), range(workers)))
+
+
+def provider_setup(provider, workers):
+    provider.service()
+    if workers > 1:
+        with ThreadPoolExecutor(workers) as pool:
+            list(pool.map(lambda _: provider.service(), range(workers)))
+
+
+def per_link(fn, links):
+    times = []
+    for _ in range(links):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return times[len(times) // 2] * 1000, times[-1] * 1000
+
+
+def concurrent(fn, setups):
+    TokenEndpoint.refreshes = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(setups) as pool:
+        list(pool.map(lambda _: fn(), range(setups)))
+    return TokenEndpoint.refreshes, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--links", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=4, help="Download workers per call.")
+    parser.add_argument("--concurrent", type=int, default=4, help="Setups starting at once with an expired token.")
+    parser.add_argument("--token-latency", type=float, default=0.15)
+    args = parser.parse_args()
+
+    TokenEndpoint.latency = args.token_latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), TokenEndpoint)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    token_uri = f"http://127.0.0.1:{server.server_port}/token"
+    # from_authorized_user_file ignores token_uri in token.json and always uses Google's endpoint.
+    google.oauth2.credentials._GOOGLE_OAUTH2_TOKEN_ENDPOINT = token_uri
+    os.chdir(tempfile.mkdtemp())
+
+    write_token(token_uri, 3600)
+    legacy = per_link(lambda: legacy_setup(args.workers), args.links)
+    provider = DriveClientProvider()
+    fresh = per_link(lambda: provider_setup(provider, args.workers), args.links)
+    print(f"steady state, {args.links} links, {args.workers} workers    median ms   max ms")
+    print(f"  authenticate + build per call     {legacy[0]:9.1f}{legacy[1]:9.1f}")
+    print(f"  DriveClientProvider               {fresh[0]:9.1f}{fresh[1]:9.1f}  (first call included)")
+
+    print(f"\nexpired token, {args.concurrent} setups at once       refreshes   wall ms")
+    write_token(token_uri, -60)
+    refreshes, wall = concurrent(lambda: legacy_setup(1), args.concurrent)
+    print(f"  authenticate + build per call     {refreshes:9d}{wall:10.0f}")
+    write_token(token_uri, -60)
+    provider = DriveClientProvider()
+    refreshes, wall = concurrent(lambda: provider_setup(provider, 1), args.concurrent)
+    print(f"  DriveClientProvider               {refreshes:9d}{wall:10.0f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
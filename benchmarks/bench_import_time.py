@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""
+Startup cost of the entry points, from `python -X importtime`.
+
+For each module it reports the cumulative import time and the heaviest
+packages it pulls in; it also times `gd.py --help` end to end. With
+--against REV the same is measured on a git revision (checked out in a
+temporary worktree) for comparison.
+
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --against HEAD~1 --runs 7
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ["cli", "gd", "task_pipeline", "task_manager", "api_client"]
+# Packages whose presence in a plain poll or `gd.py --help` means something is imported too early.
+HEAVY = ["googleapiclient", "google_auth_oauthlib", "google.auth", "httplib2", "tqdm", "bs4"]
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_profile(cwd, module):
+    """Return (cumulative µs of module, {package: cumulative µs}) for top-level packages it imports."""
+    env = dict(os.environ, PROJECT=os.environ.get("PROJECT", "project.aep"), PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=cwd, env=env, capture_output=True, text=True)
+    if result.returncode:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    packages = {}
+    total = 0
+    for match in _LINE.finditer(result.stderr):
+        cumulative, name = int(match.group(2)), match.group(4)
+        if name == module and not match.group(3).strip(" "):
+            total = cumulative
+        top = name.split(".")[0]
+        packages[top] = max(packages.get(top, 0), cumulative)
+        if name.startswith("google.auth"):
+            packages["google.auth"] = max(packages.get("google.auth", 0), cumulative)
+    return total, packages
+
+
+def median_import(cwd, module, runs):
+    profiles = [import_profile(cwd, module) for _ in range(runs)]
+    return statistics.median(total for total, _ in profiles), profiles[-1][1]
+
+
+def help_time(cwd, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "gd.py", "--help"], cwd=cwd, capture_output=True, check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def measure(cwd, runs, label):
+    print(f"\n{label}")
+    print(f"  {'module':<16}{'import ms':>10}   heavy packages loaded")
+    for module in MODULES:
+        total, packages = median_import(cwd, module, runs)
+        heavy = [f"{name} {packages[name] / 1000:.0f}" for name in HEAVY if name in packages]
+        print(f"  {module:<16}{total / 1000:>10.0f}   {', '.join(heavy) or '-'}")
+    print(f"  {'gd.py --help':<16}{help_time(cwd, runs) * 1000:>10.0f}   (wall ms, whole process)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Runs per measurement; the median is shown.")
+    parser.add_argument("--against", metavar="REV", help="Also measure this git revision.")
+    args = parser.parse_args()
+
+    if args.against:
+        worktree = tempfile.mkdtemp(prefix="import-time-")
+        subprocess.run(["git", "worktree", "add", "--detach", worktree, args.against], cwd=ROOT,
+                       check=True, capture_output=True)
+        try:
+            measure(worktree, args.runs, f"{args.against}:")
+        finally:
+            subprocess.run(["git", "worktree", "remove", "--force", worktree], cwd=ROOT, capture_output=True)
+    measure(ROOT, args.runs, "working tree:")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+"""
+Fuzz and benchmark download_links.extract_links against LEGACY_PATTERN.
+
+1. Equivalence: every line of names.txt, wrapped in HTML, plus random
+   mutations of each line, must give the same names as the legacy regex;
+   hrefs must match BeautifulSoup's <a href> values on synthetic descriptions.
+2. Throughput on the whole corpus as one description.
+3. Adversarial near-miss names ("F-Video" + "_a" * n without a valid _De-):
+   the legacy regex is run while it stays under --budget seconds per input.
+4. Unterminated <a tags ("<a " * n), which must stay linear.
+
+    python benchmarks/bench_link_extractor.py --mutations 20
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bs4 import BeautifulSoup
+from download_links import LEGACY_PATTERN, extract_download_links, extract_links
+from synthetic_tasks import make_description
+
+LEGACY = re.compile(LEGACY_PATTERN, re.VERBOSE)
+MUTATION_ALPHABET = "_-+.  DeCmABZx019С<>\"'"
+
+
+def legacy_names(text):
+    return [f"{date} {rest}" for date, rest in LEGACY.findall(text)]
+
+
+def mutate(rng, name):
+    chars = list(name)
+    for _ in range(rng.randint(1, 4)):
+        op = rng.random()
+        pos = rng.randrange(len(chars) + 1)
+        if op < 0.4 and chars:
+            del chars[min(pos, len(chars) - 1)]
+        elif op < 0.8:
+            chars.insert(pos, rng.choice(MUTATION_ALPHABET))
+        else:
+            chars[pos:pos] = rng.choice(["_De-AB", "_De-a", "-12", "_De-", " 01.02.2025 F-Video_x"])
+    return "".join(chars)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def check_equivalence(lines, mutations, seed):
+    rng = random.Random(seed)
+    cases = 0
+    for line in lines:
+        variants = [line, f"<p>{line}</p>", f"{line}-7 and {line}", f'<a href="https://x/{line}">{line}</a>']
+        variants += [mutate(rng, line) for _ in range(mutations)]
+        for text in variants:
+            expected = legacy_names(text)
+            got = extract_download_links(text)
+            assert got == expected, f"mismatch on {text!r}: {got} != {expected}"
+            cases += 1
+    for i in range(200):
+        description = make_description(rng, images=rng.randint(0, 20), links=rng.randint(0, 6))
+        soup = BeautifulSoup(description, "html.parser")
+        assert extract_links(description).hrefs == [a["href"] for a in soup.find_all("a", href=True)]
+        assert extract_download_links(description) == legacy_names(description)
+        cases += 1
+    return cases
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mutations", type=int, default=20, help="Random mutations per names.txt line.")
+    parser.add_argument("--budget", type=float, default=0.5, help="Stop timing the legacy regex past this.")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with open(os.path.join(ROOT, "names.txt"), encoding="utf-8") as f:
+        lines = [line.strip() for line in f if line.strip()]
+
+    cases = check_equivalence(lines, args.mutations, args.seed)
+    print(f"equivalence: {cases} inputs, identical results")
+
+    corpus = "".join(f"<p>{line}</p>" for line in lines) * 10
+    legacy_time, expected = timed(legacy_names, corpus)
+    new_time, got = timed(extract_download_links, corpus)
+    assert got == expected
+    print(f"corpus x10 ({len(corpus) / 1e6:.1f} MB, {len(got)} names): "
+          f"legacy {legacy_time * 1000:.1f} ms, extract_links {new_time * 1000:.1f} ms")
+
+    print(f"\nnear-miss names{'n':>8}{'legacy ms':>12}{'new ms':>10}")
+    legacy_alive = True
+    for n in (4, 8, 12, 16, 18, 20, 1000, 10000, 100000):
+        text = "01.01.2025 F-Video" + "_a" * n + "_De-x"
+        legacy_ms = "-"
+        if legacy_alive:
+            elapsed, _ = timed(LEGACY.findall, text)
+            legacy_ms = f"{elapsed * 1000:.2f}"
+            legacy_alive = elapsed * 4 < args.budget  # each +2 components roughly quadruples it
+        elapsed, names = timed(extract_download_links, text)
+        assert names == []
+        print(f"{'':15}{n:>8}{legacy_ms:>12}{elapsed * 1000:>10.2f}")
+
+    print(f"\nunterminated <a{'n':>8}{'ms':>22}")
+    for n in (1000, 5000, 20000, 100000):
+        elapsed, links = timed(extract_links, "<a " * n)
+        assert links == ([], [])
+        print(f"{'':15}{n:>8}{elapsed * 1000:>22.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+"""
+Count Drive listing requests for the old two-walk approach (count_files, then
+a second recursive listing while downloading, one page per folder) against
+gd.build_manifest on a fake tree with some folders wider than one page.
+
+    python benchmarks/bench_manifest.py --wide 250 --subfolders 12
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from googleapiclient.discovery import build
+
+import gd
+from fake_drive import FakeDrive
+
+
+def make_tree(drive, wide, subfolders, per_folder):
+    root = drive.add_folder("09.01.2025 F-Static_N-bench_Co-40_De-AS")
+    for s in range(subfolders):
+        folder = drive.add_folder(f"sub_{s:02d}", root)
+        nested = drive.add_folder("renders", folder)
+        for i in range(per_folder):
+            drive.add_file(f"shot_{i:03d}.png", nested if i % 2 else folder, b"y" * 2048, "image/png")
+    # Loose references land after the subfolders, past the first 100-item page.
+    for i in range(wide):
+        drive.add_file(f"ref_{i:04d}.jpg", root, b"x" * 1024, "image/jpeg")
+    return root
+
+
+def legacy_walk(service, folder_id):
+    """What main_downloader used to do: one walk to count, one walk to download."""
+
+    def list_one_page(fid):
+        query = f"'{fid}' in parents and trashed = false"
+        return service.files().list(q=query, fields="files(id, name, mimeType)").execute().get("files", [])
+
+    def walk(fid):
+        found = 0
+        for item in list_one_page(fid):
+            found += walk(item["id"]) if item["mimeType"] == gd.FOLDER_MIME_TYPE else 1
+        return found
+
+    walk(folder_id)         # count_files
+    return walk(folder_id)  # download_folder_sequential
+
+
+def measure(drive, fn):
+    drive.requests.clear()
+    start = time.perf_counter()
+    files = fn()
+    return files, drive.requests["list"], time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--wide", type=int, default=250, help="Files directly in the root folder.")
+    parser.add_argument("--subfolders", type=int, default=12)
+    parser.add_argument("--per-folder", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.02)
+    args = parser.parse_args()
+
+    drive = FakeDrive(latency=args.latency)
+    root = make_tree(drive, args.wide, args.subfolders, args.per_folder)
+    expected = sum(1 for meta in drive.files.values() if meta["mimeType"] != gd.FOLDER_MIME_TYPE)
+    service = build("drive", "v3", http=drive.http())
+
+    rows = [
+        ("legacy count+walk", *measure(drive, lambda: legacy_walk(service, root))),
+        ("build_manifest", *measure(drive, lambda: len(gd.build_manifest(service, root, "/tmp/unused")))),
+    ]
+    print(f"{expected} files on Drive, {args.latency * 1000:.0f} ms/request")
+    print(f"{'mode':<20}{'files seen':>12}{'list calls':>12}{'seconds':>10}")
+    for label, files, calls, elapsed in rows:
+        print(f"{label:<20}{files:>12}{calls:>12}{elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
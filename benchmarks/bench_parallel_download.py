@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""
+Compare sequential and parallel gd.download_manifest runs on a local fake
+Drive: a 300-file creative folder of small PNGs spread over a few subfolders,
+with a fixed per-request latency.
+
+    python benchmarks/bench_parallel_download.py --latency 0.03 --workers 4 8 16
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from googleapiclient.discovery import build
+
+import gd
+from fake_drive import FakeDrive
+
+
+def make_creative_folder(drive, files=300, subfolders=4, min_size=20_000, max_size=200_000):
+    rng = random.Random(42)
+    root = drive.add_folder("09.01.2025 F-Video_N-bench_Co-44_De-AH")
+    folders = [drive.add_folder(f"scene_{i:02d}", root) for i in range(subfolders)]
+    for i in range(files):
+        size = rng.randint(min_size, max_size)
+        drive.add_file(f"frame_{i:04d}.png", folders[i % subfolders], rng.randbytes(size), "image/png")
+    return root
+
+
+def run_download(drive, folder_id, dest, workers):
+    service = build("drive", "v3", http=drive.http())
+    manifest = gd.build_manifest(service, folder_id, dest)
+    gd.download_manifest(lambda: build("drive", "v3", http=drive.http()), manifest, workers=workers)
+
+
+def timed(label, fn, dest):
+    shutil.rmtree(dest, ignore_errors=True)
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    return label, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.03, help="Seconds per fake Drive request.")
+    parser.add_argument("--bandwidth", type=float, default=20e6, help="Bytes/second per connection.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[4, 8, 16])
+    args = parser.parse_args()
+
+    drive = FakeDrive(latency=args.latency, bandwidth=args.bandwidth)
+    folder_id = make_creative_folder(drive, files=args.files)
+    total_bytes = sum(len(c) for c in drive.contents.values())
+
+    tmp = tempfile.mkdtemp(prefix="gd-bench-")
+    dest = os.path.join(tmp, "download")
+    results = []
+    try:
+        results.append(timed("sequential", lambda: run_download(drive, folder_id, dest, 1), dest))
+        for workers in args.workers:
+            results.append(timed(f"parallel x{workers}", lambda: run_download(drive, folder_id, dest, workers), dest))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    baseline = results[0][1]
+    print()
+    print(f"{args.files} files, {total_bytes / 1e6:.1f} MB, {args.latency * 1000:.0f} ms/request")
+    print(f"{'mode':<14}{'seconds':>10}{'MB/s':>10}{'speed-up':>10}")
+    for label, elapsed in results:
+        print(f"{label:<14}{elapsed:>10.2f}{total_bytes / 1e6 / elapsed:>10.1f}{baseline / elapsed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
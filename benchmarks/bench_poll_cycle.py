@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+"""
+CPU and wall time of one cli.main poll cycle after get_tasks returns: the old
+data.json round-trip (pretty-printed dump, new TaskStore, json.load, filter)
+against TaskStore.load_payload with an optional background snapshot.
+
+    python benchmarks/bench_poll_cycle.py --tasks 3000 --cycles 5
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from task_store import TaskStore
+from synthetic_tasks import make_board
+
+
+def legacy_cycle(tasks, user_id, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(tasks, f, indent=4, ensure_ascii=False)
+    store = TaskStore(path)
+    store.load_tasks()
+    return store.filter_tasks_by_motioner(user_id)
+
+
+def in_memory_cycle(store, tasks, user_id):
+    store.load_payload(tasks)
+    store.save_snapshot_async(tasks)
+    return store.filter_tasks_by_motioner(user_id)
+
+
+def measure(fn, cycles):
+    wall = cpu = 0.0
+    for _ in range(cycles):
+        w, c = time.perf_counter(), time.process_time()
+        fn()
+        wall += time.perf_counter() - w
+        cpu += time.process_time() - c
+    return wall / cycles, cpu / cycles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=3000)
+    parser.add_argument("--cycles", type=int, default=5)
+    args = parser.parse_args()
+
+    tasks, users = make_board(args.tasks)
+    user_id = users[0]
+    tmp = tempfile.mkdtemp(prefix="poll-bench-")
+    try:
+        legacy = measure(lambda: legacy_cycle(tasks, user_id, os.path.join(tmp, "data.json")), args.cycles)
+        no_snapshot = TaskStore()
+        memory = measure(lambda: in_memory_cycle(no_snapshot, tasks, user_id), args.cycles)
+        snapshot = TaskStore(os.path.join(tmp, "snapshot.json"))
+        # Wall time is what the poll loop waits for; the snapshot's CPU shows up in the next cycle or the flush.
+        with_snapshot = measure(lambda: in_memory_cycle(snapshot, tasks, user_id), args.cycles)
+        snapshot.flush()
+        legacy_size = os.path.getsize(os.path.join(tmp, "data.json"))
+        compact_size = os.path.getsize(os.path.join(tmp, "snapshot.json"))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    print(f"{args.tasks} tasks, mean of {args.cycles} cycles")
+    print(f"{'cycle':<28}{'wall ms':>10}{'cpu ms':>10}")
+    for label, (wall, cpu) in [("data.json round-trip", legacy), ("load_payload", memory),
+                               ("load_payload + async save", with_snapshot)]:
+        print(f"{label:<28}{wall * 1000:>10.1f}{cpu * 1000:>10.1f}")
+    print(f"snapshot size: {legacy_size / 1e6:.1f} MB pretty-printed -> {compact_size / 1e6:.1f} MB compact")
+
+
+if __name__ == "__main__":
+    main()
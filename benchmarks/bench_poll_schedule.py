@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+"""
+Simulated day of board polling: a fixed 60 s sleep against PollScheduler.
+Board edits arrive in bursts during working hours; every poll after an edit
+is a 200 with the full board, every other poll a 304. Reports polls,
+full downloads, MB per day and how long edits waited to be seen.
+
+    python benchmarks/bench_poll_schedule.py --board-mb 4 --bursts 40
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from poll_scheduler import PollScheduler
+
+DAY = 24 * 3600
+NOT_MODIFIED_BYTES = 300
+
+
+def edit_times(bursts, seed):
+    rng = random.Random(seed)
+    times = []
+    for _ in range(bursts):
+        start = rng.uniform(9 * 3600, 19 * 3600)
+        times += [start + rng.uniform(0, 180) for _ in range(rng.randint(1, 6))]
+    return sorted(times)
+
+
+def simulate(next_delay, record, edits, board_bytes):
+    now, pending, polls, downloads, received, waits = 0.0, 0, 0, 0, 0, []
+    edits = list(edits)
+    while now < DAY:
+        seen = [t for t in edits if t <= now]
+        edits = edits[len(seen):]
+        waits += [now - t for t in seen]
+        changed = bool(seen)
+        polls += 1
+        downloads += changed
+        received += board_bytes if changed else NOT_MODIFIED_BYTES
+        record(200 if changed else 304, changed)
+        now += next_delay()
+    return polls, downloads, received, waits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--board-mb", type=float, default=4)
+    parser.add_argument("--bursts", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    # The scheduler's jitter uses the random module; seed it so runs are comparable.
+    random.seed(args.seed)
+    edits = edit_times(args.bursts, args.seed)
+    board_bytes = int(args.board_mb * 1e6)
+    scheduler = PollScheduler()
+    rows = [
+        ("fixed 60 s", simulate(lambda: 60, lambda status, changed: None, edits, board_bytes)),
+        ("PollScheduler", simulate(scheduler.next_delay, lambda status, changed: scheduler.record(status, changed),
+                                   edits, board_bytes)),
+    ]
+
+    print(f"{len(edits)} edits in {args.bursts} bursts, {args.board_mb:g} MB board")
+    print(f"{'schedule':<16}{'polls':>7}{'200s':>6}{'MB/day':>8}{'avg wait s':>12}{'max wait s':>12}")
+    for label, (polls, downloads, received, waits) in rows:
+        print(f"{label:<16}{polls:>7}{downloads:>6}{received / 1e6:>8.0f}"
+              f"{sum(waits) / len(waits):>12.1f}{max(waits):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""
+Re-sync cost on a fake Drive: download a 500-file folder, edit a few files
+(including a Google Docs item), then re-run in normal and sync mode and count
+the Drive requests each run makes.
+
+    python benchmarks/bench_resync.py --files 500 --changed 5
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from googleapiclient.discovery import build
+
+import gd
+from fake_drive import FakeDrive
+
+
+def run(drive, service, folder_id, dest, sync):
+    drive.requests.clear()
+    start = time.perf_counter()
+    manifest = gd.build_manifest(service, folder_id, dest)
+    failed = gd.download_to_folder(lambda: service, manifest, dest, sync=sync)
+    return time.perf_counter() - start, dict(drive.requests), len(failed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--changed", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.005)
+    args = parser.parse_args()
+
+    drive = FakeDrive(latency=args.latency)
+    root = drive.add_folder("16.01.2025 F-Static_N-bench_Co-40_De-AS")
+    ids = [drive.add_file(f"asset_{i:04d}.png", root, os.urandom(4096), "image/png") for i in range(args.files)]
+    brief = drive.add_file("brief", root, b"%PDF brief v1", "application/vnd.google-apps.document")
+    service = build("drive", "v3", http=drive.http())
+
+    tmp = tempfile.mkdtemp(prefix="gd-resync-")
+    dest = os.path.join(tmp, "folder")
+    try:
+        rows = [("initial download", *run(drive, service, root, dest, sync=False))]
+        rows.append(("unchanged, sync", *run(drive, service, root, dest, sync=True)))
+        for file_id in ids[:args.changed]:
+            # Same size, different bytes: invisible to the existence/size check.
+            drive.set_content(file_id, os.urandom(4096))
+        drive.set_content(brief, b"%PDF brief v2")
+        rows.append((f"{args.changed + 1} edited, normal", *run(drive, service, root, dest, sync=False)))
+        rows.append((f"{args.changed + 1} edited, sync", *run(drive, service, root, dest, sync=True)))
+        current = open(os.path.join(dest, "brief.pdf"), "rb").read() == drive.contents[brief]
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    print()
+    print(f"{'run':<22}{'seconds':>9}{'list':>6}{'media':>7}{'export':>8}")
+    for label, elapsed, requests, _ in rows:
+        print(f"{label:<22}{elapsed:>9.2f}{requests.get('list', 0):>6}{requests.get('media', 0):>7}{requests.get('export', 0):>8}")
+    print(f"edited Docs item re-exported by sync: {current}")
+
+
+if __name__ == "__main__":
+    main()
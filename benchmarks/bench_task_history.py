@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""
+TaskHistory on a synthetic board: a full-board upsert into an empty
+database, an upsert of the same board (nothing changed), the same again
+after reopening the database, an upsert with a few status changes, a
+time_in_status query and reading the board back (restore). The size is
+measured after close(), i.e. with the WAL checkpointed.
+
+    python benchmarks/bench_task_history.py --tasks 10000 --churn 20
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from task_history import TaskHistory
+from synthetic_tasks import STATUSES, make_board
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--churn", type=int, default=20, help="Tasks changed before the third upsert.")
+    args = parser.parse_args()
+
+    tasks, _ = make_board(args.tasks)
+    rng = random.Random(3)
+    with tempfile.TemporaryDirectory() as tmp:
+        history = TaskHistory(os.path.join(tmp, "history.db"))
+        rows = [("full board, empty db", *timed(lambda: history.upsert(tasks)))]
+        rows.append(("same board again", *timed(lambda: history.upsert(tasks))))
+        history.close()
+        history = TaskHistory(os.path.join(tmp, "history.db"))
+        rows.append(("same board, reopened", *timed(lambda: history.upsert(tasks))))
+        for task in rng.sample(tasks, args.churn):
+            task["status"] = rng.choice(STATUSES)
+            task["statusChangeTime"] = "2025-03-02T00:00:00Z"
+        rows.append((f"{args.churn} changed", *timed(lambda: history.upsert(tasks))))
+        elapsed, per_motioner = timed(lambda: history.time_in_status("MOTION_IN_PROCESS", "2025-02-01", "2025-03-01"))
+        rows.append(("time_in_status query", elapsed, len(per_motioner)))
+        rows.append(("board() (restore)", *timed(lambda: len(history.board()))))
+        history.close()
+        size = sum(os.path.getsize(os.path.join(tmp, name)) for name in os.listdir(tmp))
+
+    print(f"{args.tasks} tasks, database {size / 1e6:.0f} MB")
+    print(f"{'operation':<24}{'ms':>8}{'rows':>8}")
+    for label, elapsed, count in rows:
+        print(f"{label:<24}{elapsed * 1000:>8.0f}{count:>8}")
+
+
+if __name__ == "__main__":
+    main()
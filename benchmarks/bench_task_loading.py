@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+"""
+Task loading on a synthetic raw payload: json.loads + Task(**task_dict) per
+element (the old load_tasks path) against TaskStore.load_payload validating
+the bytes in pydantic-core.
+
+    python benchmarks/bench_task_loading.py --tasks 10000 --repeat 5
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Task
+from task_store import TASK_LIST, TaskStore
+from synthetic_tasks import make_payload
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    raw, _ = make_payload(args.tasks)
+    store = TaskStore()
+    decoded = json.loads(raw)
+
+    rows = [
+        ("json.loads + Task(**d)", best_of(lambda: [Task(**d) for d in json.loads(raw)], args.repeat)),
+        ("TASK_LIST.validate_json", best_of(lambda: TASK_LIST.validate_json(raw), args.repeat)),
+        ("load_payload(bytes)", best_of(lambda: store.load_payload(raw), args.repeat)),
+        ("load_payload(decoded)", best_of(lambda: store.load_payload(decoded), args.repeat)),
+    ]
+    store.load_payload(raw)
+    assert store.tasks == [Task(**d) for d in json.loads(raw)]
+
+    print(f"{args.tasks} tasks, {len(raw) / 1e6:.1f} MB payload, best of {args.repeat}")
+    print(f"{'path':<26}{'ms':>8}{'speed-up':>10}")
+    for label, elapsed in rows:
+        print(f"{label:<26}{elapsed * 1000:>8.0f}{rows[0][1] / elapsed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+"""
+Bytes per task held by a TaskStore in Task (pydantic) and CompactTask form,
+measured with tracemalloc. The description HTML is the same string object in
+both forms, so it is reported separately.
+
+    python benchmarks/bench_task_memory.py --tasks 10000
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from task_store import TaskStore
+from synthetic_tasks import make_payload
+
+
+def held_bytes(raw, compact):
+    gc.collect()
+    tracemalloc.start()
+    store = TaskStore(compact=compact)
+    store.load_payload(raw)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    descriptions = sum(sys.getsizeof(task.description) for task in store.tasks if task.description)
+    return current, descriptions, len(store.tasks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=10000)
+    args = parser.parse_args()
+
+    raw, _ = make_payload(args.tasks)
+    print(f"{args.tasks} tasks, incl. indexes")
+    print(f"{'form':<14}{'bytes/task':>12}{'w/o description':>17}")
+    rows = {}
+    for label, compact in (("Task", False), ("CompactTask", True)):
+        total, descriptions, count = held_bytes(raw, compact)
+        rows[label] = (total - descriptions) / count
+        print(f"{label:<14}{total / count:>12.0f}{rows[label]:>17.0f}")
+    print(f"metadata overhead reduced {rows['Task'] / rows['CompactTask']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+"""
+Cost of cli.main's task selection (motioner scan + status scan) against
+TaskStore.query on boards of growing size. Users grow with the board, so a
+motioner's share stays about the same while the status buckets grow; the
+query column should stay flat.
+
+    python benchmarks/bench_task_query.py --sizes 1000 5000 20000 50000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from task_store import TaskStore
+from synthetic_tasks import make_board
+
+ACTIVE = {"MOTION_TODO", "MOTION_IN_PROCESS"}
+
+
+def timeit(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000, 50000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'tasks':>8}{'index build ms':>16}{'scan us':>10}{'query us':>10}{'matches':>9}")
+    for size in args.sizes:
+        tasks, users = make_board(size, user_count=max(60, size // 50))
+        store = TaskStore()
+        store.load_payload(tasks)
+        build, _ = timeit(lambda: store._set_tasks(store.tasks), 3)
+        user_id = users[0]
+
+        def legacy():
+            return [t for t in store.tasks
+                    if any(m.userId == user_id for m in t.motioners) and t.status in ACTIVE]
+
+        scan_time, expected = timeit(legacy, args.repeat)
+        query_time, found = timeit(lambda: store.query(motioner=user_id, status=ACTIVE), args.repeat)
+        assert found == expected
+        print(f"{size:>8}{build * 1000:>16.1f}{scan_time * 1e6:>10.0f}{query_time * 1e6:>10.0f}{len(found):>9}")
+
+
+if __name__ == "__main__":
+    main()
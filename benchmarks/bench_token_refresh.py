@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+"""
+Poll a local fake of the Adbraze API whose AuthenticationToken (a JWT) lives
+only --lifetime seconds, from several threads sharing one AdbrazeClient, and
+count what the server saw: 401s, refreshes and logins.
+
+"reactive" disables refreshing ahead of expiry (refresh_margin=None), so the
+token is only renewed after a 401; "proactive" is the default client.
+
+    python benchmarks/bench_token_refresh.py --seconds 20 --threads 4
+"""
+import argparse
+import base64
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from api_client import AdbrazeClient
+
+
+def make_jwt(lifetime):
+    now = time.time()
+    claims = base64.urlsafe_b64encode(json.dumps({"iat": now, "exp": now + lifetime}).encode()).rstrip(b"=")
+    return f"eyJhbGciOiJub25lIn0.{claims.decode()}.sig"
+
+
+def token_exp(token):
+    claims = token.split(".")[1]
+    return json.loads(base64.urlsafe_b64decode(claims + "=" * (-len(claims) % 4)))["exp"]
+
+
+class FakeAdbraze(BaseHTTPRequestHandler):
+    lifetime = 4.0
+    hits = Counter()
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def _count(self, what):
+        with self.lock:
+            self.hits[what] += 1
+
+    def _issue_tokens(self):
+        body = b'{"userId": "u1"}'
+        self.send_response(200)
+        self.send_header("Set-Cookie", f"AuthenticationToken={make_jwt(self.lifetime)}; Path=/")
+        self.send_header("Set-Cookie", "RefreshToken=r1; Path=/")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self._count("login" if self.path.endswith("/auth/login") else "refresh")
+        self._issue_tokens()
+
+    def do_GET(self):
+        cookies = dict(part.strip().split("=", 1) for part in (self.headers.get("Cookie") or "").split(";") if "=" in part)
+        token = cookies.get("AuthenticationToken")
+        if not token or token_exp(token) <= time.time():
+            self._count("401")
+            self.send_response(401)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self._count("tasks")
+        self.send_response(304)
+        self.end_headers()
+
+
+def run(base_url, mode, seconds, threads, interval):
+    FakeAdbraze.hits.clear()
+    with contextlib.redirect_stdout(io.StringIO()):
+        client = AdbrazeClient()
+        client.base_url = base_url
+        client.refresh_margin = None if mode == "reactive" else client.refresh_margin
+        client.login()
+        latencies = []
+        deadline = time.monotonic() + seconds
+
+        def poll():
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                client.get_tasks(raw=True)
+                latencies.append(time.perf_counter() - start)
+                time.sleep(interval)
+
+        workers = [threading.Thread(target=poll) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        client.close()
+    hits = dict(FakeAdbraze.hits)
+    latencies.sort()
+    print(f"{mode:>10}{len(latencies):>8}{hits.get('401', 0):>7}{hits.get('refresh', 0):>9}"
+          f"{hits.get('login', 0) - 1:>8}{latencies[int(len(latencies) * 0.99)] * 1000:>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--interval", type=float, default=0.2, help="Pause between polls per thread.")
+    parser.add_argument("--lifetime", type=float, default=4.0, help="Token lifetime in seconds.")
+    args = parser.parse_args()
+
+    FakeAdbraze.lifetime = args.lifetime
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeAdbraze)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}/api/v1"
+    os.chdir(tempfile.mkdtemp())  # cookies.pkl
+
+    print(f"{args.threads} threads polling for {args.seconds:.0f}s, token lifetime {args.lifetime:.0f}s")
+    print(f"{'mode':>10}{'polls':>8}{'401s':>7}{'refresh':>9}{'relogin':>8}{'p99 ms':>12}")
+    for mode in ("reactive", "proactive"):
+        run(base_url, mode, args.seconds, args.threads, args.interval)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+"""
+Compare the HTTP stacks a task setup used before transport.py with the
+shared pools, against a local HTTPS server (self-signed certificate made with
+openssl) that counts the TLS connections it accepts.
+
+Each simulated task setup makes:
+- 1 board poll (AdbrazeClient's session);
+- --hrefs reference downloads on 6 threads (before: a new requests.Session per task);
+- --lists Drive files().list calls and --media downloads on 4 worker
+  threads through googleapiclient (before: httplib2.Http per service).
+
+    python benchmarks/bench_transport.py --tasks 20
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import ssl
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import httplib2
+import requests
+from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build
+
+import transport
+
+
+class Server(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.005
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with self.lock:
+            Server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        if self.path.startswith("/drive/v3/files?"):
+            body = b'{"files": [{"id": "f1", "name": "a.mp4"}]}'
+            content_type = "application/json"
+        else:
+            body = b"x" * 64 * 1024
+            content_type = "application/octet-stream"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def make_certificate(directory):
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1", "-subj", "/CN=127.0.0.1",
+                    "-addext", "subjectAltName=IP:127.0.0.1", "-keyout", key, "-out", cert],
+                   check=True, capture_output=True)
+    return cert, key
+
+
+def drive(base, http):
+    return build("drive", "v3", http=AuthorizedHttp(Credentials(token="token"), http=http),
+                 client_options={"api_endpoint": base}, static_discovery=True)
+
+
+def setup_task(base, mode, args, board_session, cert, latencies):
+    """One task setup's worth of requests; returns its wall time."""
+    start = time.perf_counter()
+
+    def timed(fn, *a, **kw):
+        t = time.perf_counter()
+        result = fn(*a, **kw)
+        latencies.append(time.perf_counter() - t)
+        return result
+
+    timed(board_session.get, f"{base}/api/v1/task-manager", timeout=15)
+
+    href_session = requests.Session() if mode == "before" else transport.new_session()
+    with ThreadPoolExecutor(6) as pool:
+        list(pool.map(lambda i: timed(href_session.get, f"{base}/ref/{i}", timeout=15).content, range(args.hrefs)))
+
+    new_http = (lambda: httplib2.Http(ca_certs=cert)) if mode == "before" else transport.RequestsHttp
+    service = drive(base, new_http())
+    for i in range(args.lists):
+        timed(service.files().list(q=f"'folder{i}' in parents").execute)
+
+    local = threading.local()
+
+    def media(i):
+        if not hasattr(local, "service"):
+            local.service = drive(base, new_http())
+        request = local.service.files().get_media(fileId=f"file{i}")
+        timed(request.http.request, request.uri, "GET")
+
+    with ThreadPoolExecutor(4) as pool:
+        list(pool.map(media, range(args.media)))
+    return time.perf_counter() - start
+
+
+def run(base, mode, args, cert):
+    Server.connections = 0
+    board_session = requests.Session() if mode == "before" else transport.new_session()
+    latencies, walls = [], []
+    for _ in range(args.tasks):
+        walls.append(setup_task(base, mode, args, board_session, cert, latencies))
+    latencies.sort()
+    requests_made = len(latencies)
+    p = lambda values, q: sorted(values)[min(int(len(values) * q), len(values) - 1)] * 1000
+    print(f"{mode:>8}{requests_made:>10}{Server.connections:>12}{1 - Server.connections / requests_made:>9.0%}"
+          f"{p(walls, 0.5):>12.0f}{p(latencies, 0.5):>9.1f}{p(latencies, 0.99):>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=20)
+    parser.add_argument("--hrefs", type=int, default=6)
+    parser.add_argument("--lists", type=int, default=20)
+    parser.add_argument("--media", type=int, default=8)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    cert, key = make_certificate(directory)
+    os.environ["REQUESTS_CA_BUNDLE"] = cert
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Server)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"https://127.0.0.1:{server.server_port}"
+
+    print(f"{args.tasks} task setups, {1 + args.hrefs + args.lists + args.media} requests each")
+    print(f"{'stack':>8}{'requests':>10}{'handshakes':>12}{'reused':>9}{'setup ms':>12}{'p50 ms':>9}{'p99 ms':>9}")
+    for mode in ("before", "shared"):
+        run(base, mode, args, cert)
+    print(f"transport.stats: {transport.stats.summary()}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
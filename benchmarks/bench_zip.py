@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""
+Package a mixed media folder (MP4/PNG/JPG sources plus compressible project
+files, JSON and text) with the old single-threaded ZIP_DEFLATED loop and with
+gd.zip_folder, then check both archives with testzip outside the timing
+(zip_folder's own check is turned off here).
+
+    python benchmarks/bench_zip.py --scale 1.0 --workers 4
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gd
+
+
+def make_media_folder(folder, scale):
+    rng = random.Random(7)
+    words = [bytes(rng.choices(b"abcdefghijklmnopqrstuvwxyz", k=rng.randint(3, 9))) for _ in range(2000)]
+
+    def text(size):
+        out = bytearray()
+        while len(out) < size:
+            out += b" ".join(rng.choices(words, k=200)) + b"\n"
+        return bytes(out[:size])
+
+    layout = [
+        ("footage", ".mp4", 6, 12_000_000),
+        ("renders", ".png", 60, 600_000),
+        ("refs", ".jpg", 40, 300_000),
+        ("project", ".aep", 4, 8_000_000),
+        ("data", ".json", 20, 1_500_000),
+        ("notes", ".txt", 20, 400_000),
+    ]
+    for sub, ext, count, size in layout:
+        os.makedirs(os.path.join(folder, sub), exist_ok=True)
+        size = int(size * scale)
+        compressible = ext in (".aep", ".json", ".txt")
+        for i in range(count):
+            with open(os.path.join(folder, sub, f"{sub}_{i:03d}{ext}"), "wb") as f:
+                f.write(text(size) if compressible else os.urandom(size))
+
+
+def legacy_zip(folder_path):
+    zip_name = f"{folder_path}.zip"
+    with zipfile.ZipFile(zip_name, "w", zipfile.ZIP_DEFLATED) as zipf:
+        for root, _, files in os.walk(folder_path):
+            for file in files:
+                file_path = os.path.join(root, file)
+                zipf.write(file_path, os.path.relpath(file_path, start=os.path.dirname(folder_path)))
+    return zip_name
+
+
+def measure(label, fn, folder):
+    start = time.perf_counter()
+    cpu = time.process_time()
+    zip_name = fn(folder)
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu
+    size = os.path.getsize(zip_name)
+    with zipfile.ZipFile(zip_name) as zf:
+        bad = zf.testzip()
+        entries = len(zf.namelist())
+    os.remove(zip_name)
+    return label, elapsed, cpu, size, entries, bad
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every file size by this.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[os.cpu_count()])
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="gd-zip-")
+    folder = os.path.join(tmp, "09.01.2025 F-Video_N-bench_Co-44_De-AH")
+    try:
+        make_media_folder(folder, args.scale)
+        total = sum(os.path.getsize(os.path.join(r, f)) for r, _, fs in os.walk(folder) for f in fs)
+        rows = [measure("legacy ZIP_DEFLATED", legacy_zip, folder)]
+        for workers in args.workers:
+            rows.append(measure(f"zip_folder x{workers}", lambda path: gd.zip_folder(path, workers=workers, verify=False), folder))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    print(f"\n{total / 1e6:.0f} MB input, {os.cpu_count()} CPUs")
+    print(f"{'mode':<22}{'wall s':>8}{'cpu s':>8}{'zip MB':>9}{'entries':>9}  ok")
+    for label, elapsed, cpu, size, entries, bad in rows:
+        print(f"{label:<22}{elapsed:>8.2f}{cpu:>8.2f}{size / 1e6:>9.1f}{entries:>9}  {bad is None}")
+
+
+if __name__ == "__main__":
+    main()
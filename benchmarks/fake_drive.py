@@ -0,0 +1,292 @@
+# fake_drive.py
+"""
+In-memory stand-in for the Drive v3 REST API used by the benchmarks.
+
+FakeDrive holds a tree of folders and files; FakeDrive.http() returns an
+httplib2-compatible object that can be passed to
+build("drive", "v3", http=...), so gd.py runs its real request code against
+it. Every request sleeps for `latency` seconds (plus size / bandwidth for
+content) to imitate a round-trip to Google. A multipart batch request is one
+round-trip for all of its calls; requests["batch"] counts batches and
+requests["batched"] the calls they carried.
+"""
+import email.parser
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from urllib.parse import urlparse, parse_qs
+
+import httplib2
+
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+BATCH_LIMIT = 100
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+_TOKEN = re.compile(r"\s*('(?:\\.|[^'\\])*'|\(|\)|!=|=|[A-Za-z_]+)")
+
+
+def _tokenize(query):
+    tokens = []
+    pos = 0
+    query = query.strip()
+    while pos < len(query):
+        match = _TOKEN.match(query, pos)
+        if not match:
+            raise ValueError(f"Bad query near: {query[pos:]}")
+        tokens.append(match.group(1))
+        pos = match.end()
+    return tokens
+
+
+def _literal(token):
+    if token.startswith("'"):
+        return re.sub(r"\\(.)", r"\1", token[1:-1])
+    return {"true": True, "false": False}.get(token, token)
+
+
+class _Query:
+    """Tiny recursive-descent evaluator for the subset of Drive's q syntax gd.py uses."""
+
+    def __init__(self, query):
+        self.tokens = _tokenize(query)
+        self.pos = 0
+        self.tree = self._or()
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _take(self):
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def _or(self):
+        terms = [self._and()]
+        while self._peek() == "or":
+            self._take()
+            terms.append(self._and())
+        return ("or", terms)
+
+    def _and(self):
+        terms = [self._term()]
+        while self._peek() == "and":
+            self._take()
+            terms.append(self._term())
+        return ("and", terms)
+
+    def _term(self):
+        if self._peek() == "(":
+            self._take()
+            tree = self._or()
+            self._take()  # ")"
+            return tree
+        left = self._take()
+        op = self._take()
+        right = self._take()
+        if op == "in":
+            return ("in", _literal(left), right)
+        return (op, left, _literal(right))
+
+    def matches(self, meta, tree=None):
+        kind, *args = tree or self.tree
+        if kind == "or":
+            return any(self.matches(meta, t) for t in args[0])
+        if kind == "and":
+            return all(self.matches(meta, t) for t in args[0])
+        if kind == "in":
+            value, field = args
+            return value in meta.get(field, [])
+        field, value = args
+        return (meta.get(field) == value) == (kind == "=")
+
+
+class FakeDrive:
+    def __init__(self, latency=0.02, bandwidth=None):
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.files = {}
+        self.contents = {}
+        self.requests = Counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._next_id = 0
+
+    def _new_id(self):
+        with self._lock:
+            self._next_id += 1
+            return f"fake{self._next_id:06d}"
+
+    def add_folder(self, name, parent="root"):
+        folder_id = self._new_id()
+        self.files[folder_id] = {
+            "id": folder_id,
+            "name": name,
+            "mimeType": FOLDER_MIME_TYPE,
+            "parents": [parent],
+            "trashed": False,
+            "modifiedTime": _now(),
+        }
+        return folder_id
+
+    def add_file(self, name, parent, content=b"", mime_type="application/octet-stream"):
+        file_id = self._new_id()
+        self.files[file_id] = {
+            "id": file_id,
+            "name": name,
+            "mimeType": mime_type,
+            "parents": [parent],
+            "trashed": False,
+        }
+        self.set_content(file_id, content)
+        return file_id
+
+    def set_content(self, file_id, content):
+        """Replace a file's bytes, bumping modifiedTime and md5 like Drive does."""
+        meta = self.files[file_id]
+        self.contents[file_id] = content
+        meta["modifiedTime"] = _now()
+        if not meta["mimeType"].startswith("application/vnd.google-apps."):
+            meta["size"] = str(len(content))
+            meta["md5Checksum"] = hashlib.md5(content).hexdigest()
+
+    def http(self):
+        return FakeHttp(self)
+
+    # Request handling -------------------------------------------------------
+
+    def handle(self, uri, method="GET", headers=None, body=None):
+        parsed = urlparse(uri)
+        params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        path = parsed.path
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+
+        if path == "/batch/drive/v3" and method == "POST":
+            return self._batch(headers, body)
+
+        if path == "/drive/v3/files" and method == "GET":
+            self._delay()
+            return self._list(params)
+
+        match = re.fullmatch(r"/drive/v3/files/([^/]+)(/export)?", path)
+        if match and method == "GET":
+            file_id, export = match.groups()
+            if file_id not in self.files:
+                self._delay()
+                self.requests["missing"] += 1
+                return _json_response(404, {"error": {"code": 404, "message": f"File not found: {file_id}."}})
+            if export:
+                return self._media(file_id, headers, exported=True)
+            if params.get("alt") == "media":
+                return self._media(file_id, headers)
+            self._delay()
+            self.requests["get"] += 1
+            return _json_response(200, self.files[file_id])
+
+        return _json_response(404, {"error": {"code": 404, "message": f"Unknown endpoint {path}"}})
+
+    def _list(self, params):
+        self.requests["list"] += 1
+        q = params.get("q", "trashed = false")
+        for parent in re.findall(r"'([^']+)' in parents", q):
+            if parent != "root" and parent not in self.files:
+                return _json_response(404, {"error": {"code": 404, "message": f"File not found: {parent}."}})
+        query = _Query(q)
+        matched = sorted(
+            (meta for meta in self.files.values() if query.matches(meta)),
+            key=lambda meta: meta["id"],
+        )
+        page_size = min(int(params.get("pageSize", DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+        offset = int(params.get("pageToken", 0))
+        page = matched[offset:offset + page_size]
+        result = {"files": [{k: v for k, v in meta.items() if k != "trashed"} for meta in page]}
+        if offset + page_size < len(matched):
+            result["nextPageToken"] = str(offset + page_size)
+        return _json_response(200, result)
+
+    def _media(self, file_id, headers, exported=False):
+        self.requests["export" if exported else "media"] += 1
+        content = self.contents[file_id]
+        total = len(content)
+        byte_range = headers.get("range")
+        if exported or not byte_range:
+            self._delay(len(content))
+            return httplib2.Response({"status": 200, "content-length": str(total)}), content
+        start, _, end = byte_range.split("=", 1)[1].partition("-")
+        start = int(start)
+        end = min(int(end) if end else total - 1, total - 1)
+        if start >= total:
+            self._delay()
+            return httplib2.Response({"status": 416, "content-range": f"bytes */{total}"}), b""
+        chunk = content[start:end + 1]
+        self._delay(len(chunk))
+        return httplib2.Response({
+            "status": 206,
+            "content-range": f"bytes {start}-{end}/{total}",
+            "content-length": str(len(chunk)),
+        }), chunk
+
+    def _batch(self, headers, body):
+        self._delay()
+        if isinstance(body, bytes):
+            body = body.decode("utf-8")
+        message = email.parser.Parser().parsestr(f"content-type: {headers['content-type']}\r\n\r\n{body}")
+        parts = message.get_payload()
+        if len(parts) > BATCH_LIMIT:
+            return _json_response(400, {"error": {"code": 400, "message": "Too many requests in batch."}})
+        self.requests["batch"] += 1
+        self.requests["batched"] += len(parts)
+        boundary = "batch_fake_drive"
+        out = []
+        self._local.batched = True
+        try:
+            for part in parts:
+                request_line, _, rest = part.get_payload().partition("\n")
+                method, target, _ = request_line.split(" ", 2)
+                head, _, inner_body = rest.replace("\r\n", "\n").partition("\n\n")
+                inner_headers = dict(line.split(": ", 1) for line in head.splitlines() if ": " in line)
+                resp, content = self.handle(f"https://www.googleapis.com{target}", method, inner_headers,
+                                            inner_body or None)
+                out.append(
+                    f"--{boundary}\r\nContent-Type: application/http\r\n"
+                    f"Content-ID: <response-{part['Content-ID'][1:-1]}>\r\n\r\n"
+                    f"HTTP/1.1 {resp.status} {'OK' if resp.status < 300 else 'Error'}\r\n"
+                    f"Content-Type: application/json; charset=UTF-8\r\n\r\n{content.decode('utf-8')}\r\n"
+                )
+        finally:
+            self._local.batched = False
+        out.append(f"--{boundary}--\r\n")
+        response = httplib2.Response({"status": 200, "content-type": f"multipart/mixed; boundary={boundary}"})
+        return response, "".join(out).encode("utf-8")
+
+    def _delay(self, nbytes=0):
+        if getattr(self._local, "batched", False):
+            return
+        seconds = self.latency
+        if self.bandwidth and nbytes:
+            seconds += nbytes / self.bandwidth
+        if seconds:
+            time.sleep(seconds)
+
+
+class FakeHttp:
+    """httplib2.Http look-alike bound to a FakeDrive."""
+
+    def __init__(self, drive):
+        self.drive = drive
+
+    def request(self, uri, method="GET", body=None, headers=None, redirections=None, connection_type=None):
+        return self.drive.handle(uri, method=method, headers=headers, body=body)
+
+
+def _json_response(status, payload):
+    body = json.dumps(payload).encode("utf-8")
+    return httplib2.Response({"status": status, "content-type": "application/json; charset=UTF-8"}), body
+
+
+def _now():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
@@ -0,0 +1,89 @@
+# synthetic_tasks.py
+"""Generate Adbraze /task-manager payloads shaped like the real board for the benchmarks."""
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+STATUSES = [
+    "BACKLOG", "ILLUSTRATION_TODO", "ILLUSTRATION_IN_PROCESS", "ILLUSTRATION_REVIEW",
+    "MOTION_TODO", "MOTION_IN_PROCESS", "MOTION_REVIEW", "DONE",
+]
+DESIGNERS = ["AH", "IS", "LG", "AS", "OP", "VF", "HC", "VT"]
+
+
+def _uuid(rng):
+    return "%08x-%04x-%04x-%04x-%012x" % (
+        rng.getrandbits(32), rng.getrandbits(16), rng.getrandbits(16), rng.getrandbits(16), rng.getrandbits(48)
+    )
+
+
+def make_description(rng, images=12, links=4, paragraphs=20):
+    parts = []
+    for p in range(paragraphs):
+        words = " ".join(rng.choice(["hook", "brand", "logo", "sound", "cut", "zoom", "text", "CTA", "fast", "slow"])
+                         for _ in range(rng.randint(15, 40)))
+        parts.append(f"<p>{words}</p>")
+        if p % 3 == 0:
+            de = rng.choice(DESIGNERS)
+            name = (f"{rng.randint(1, 28):02d}.0{rng.randint(1, 9)}.2025 F-{rng.choice(['Video', 'Static'])}"
+                    f"_N-ref-{rng.randint(1, 999)}_Co-{rng.randint(30, 99)}_H-{de}-{rng.randint(100, 999)}"
+                    f"_P-{rng.randint(1, 60):02d}_Fe-{rng.randint(1, 20):02d}_Cm-{de}_De-{rng.choice(DESIGNERS)}")
+            parts.append(f"<p>Source: {name}</p>")
+    for i in range(images):
+        parts.append(f'<p><img src="https://cdn.adbraze.com/uploads/{_uuid(rng)}.png" alt="ref {i}" '
+                     f'width="{rng.randint(200, 1200)}" height="{rng.randint(200, 1200)}"></p>')
+    for i in range(links):
+        host = rng.choice(["www.dropbox.com/s/abc/clip.mp4?dl=0", "drive.google.com/file/d/1AbC/view",
+                           "onedrive.live.com/?resid=1&authkey=2"])
+        parts.append(f'<p><a href="https://{host}&n={i}">reference {i}</a></p>')
+    return "".join(parts)
+
+
+def make_task(rng, now, users):
+    created = now - timedelta(days=rng.randint(0, 400), minutes=rng.randint(0, 1440))
+    motioners = rng.sample(users, rng.choice([1, 1, 1, 2]))
+    illustrators = rng.sample(users, rng.choice([0, 1, 1, 2]))
+    return {
+        "taskId": _uuid(rng),
+        "name": f"{created:%d.%m.%Y} F-{rng.choice(['Video', 'Static'])}_N-task-{rng.randint(1, 99999)}"
+                f"_Co-{rng.randint(30, 99)}_De-{rng.choice(DESIGNERS)}",
+        "creatingTime": created.isoformat().replace("+00:00", "Z"),
+        "finishTime": None if rng.random() < 0.7 else (created + timedelta(days=3)).isoformat().replace("+00:00", "Z"),
+        "statusChangeTime": (created + timedelta(hours=rng.randint(1, 200))).isoformat().replace("+00:00", "Z"),
+        "launchIllustration": rng.random() < 0.5,
+        "launchMotion": rng.random() < 0.8,
+        "needIllustrator": rng.choice([None, True, False]),
+        "referenceLink": None,
+        "description": make_description(rng, images=rng.randint(2, 20)),
+        "adPlatforms": rng.sample(["FACEBOOK", "TIKTOK", "GOOGLE", "SNAPCHAT"], rng.randint(1, 3)),
+        "localizations": rng.sample(["EN", "DE", "FR", "ES", "PT", "IT"], rng.randint(1, 4)),
+        "priority": rng.randint(0, 5),
+        "status": rng.choice(STATUSES),
+        "imageResultLink": None,
+        "motionResultLink": None,
+        "accountId": f"acc-{rng.randint(1, 40):03d}",
+        "hypothesisId": _uuid(rng) if rng.random() < 0.5 else None,
+        "creatorId": rng.choice(users),
+        "illustratorId": illustrators[0] if len(illustrators) == 1 else None,
+        "motionerId": motioners[0] if len(motioners) == 1 else None,
+        "illustrationReviewerId": None,
+        "motionReviewerId": rng.choice(users),
+        "childTaskId": None,
+        "products": [{"productId": _uuid(rng)} for _ in range(rng.randint(1, 3))],
+        "motioners": [{"userId": u} for u in motioners],
+        "illustrators": [{"userId": u} for u in illustrators],
+    }
+
+
+def make_board(count, seed=1, user_count=60):
+    """Return (tasks, users): `count` task dicts and the user ids they are assigned to."""
+    rng = random.Random(seed)
+    users = [_uuid(rng) for _ in range(user_count)]
+    now = datetime(2025, 3, 1, tzinfo=timezone.utc)
+    return [make_task(rng, now, users) for _ in range(count)], users
+
+
+def make_payload(count, seed=1):
+    """The board as raw response bytes, the way AdbrazeClient receives it."""
+    tasks, users = make_board(count, seed)
+    return json.dumps(tasks, ensure_ascii=False).encode("utf-8"), users
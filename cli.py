@@ -1,39 +1,106 @@
 #cli.py
+import os
 import time
-import json
+import argparse
 from trash.old_client import AdbrazeClient
-# from api_client import AdbrazeClient
 from task_store import TaskStore
-from task_manager import setup_new_task
+from task_history import TaskHistory
+from poll_scheduler import PollScheduler
+from task_pipeline import TaskPipeline
+from setup_journal import default_journal
+from transport import stats as http_stats
+
+# Statuses in which a motioner's task needs a local setup.
+ACTIVE_STATUSES = {"MOTION_TODO", "MOTION_IN_PROCESS"}
+# Changes that can make a task newly relevant to the motioner.
+SETUP_EVENTS = {"created", "status_changed", "reassigned"}
 
 def main():
+    parser = argparse.ArgumentParser(description="Poll Adbraze for new motion tasks and set them up locally.")
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        default=1,
+        help="Number of Drive files to download concurrently per task (default: 1, sequential)."
+    )
+    parser.add_argument(
+        "--setup-workers",
+        type=int,
+        default=2,
+        help="Number of tasks set up at the same time while polling continues (default: 2)."
+    )
+    parser.add_argument(
+        "--history",
+        metavar="DB",
+        default=os.getenv("TASK_HISTORY_DB", "task_history.db"),
+        help="SQLite file that keeps the board and its status history (default: $TASK_HISTORY_DB or task_history.db)."
+    )
+    parser.add_argument(
+        "--keep-days",
+        type=float,
+        default=180,
+        help="Prune history older than this many days at startup (default: 180)."
+    )
+    args = parser.parse_args()
+
     client = AdbrazeClient()
     # Ensure we have a valid token
     if not client.session.cookies.get("AuthenticationToken"):
         if not client.login():
             return
 
-    while True:
-        tasks = client.get_tasks()
-        if tasks:
-            with open("data.json", "w", encoding="utf-8") as f:
-                json.dump(tasks, f, indent=4, ensure_ascii=False)
-            print(f"Cached {len(tasks)} tasks.")
+    history = TaskHistory(args.history)
+    history.prune(args.keep_days)
+    store = TaskStore(compact=True, history=history)
+    if store.restore():
+        # The board we have is the one this ETag names, so the first poll can be a 304.
+        client.etag = history.get_meta("etag")
+        print(f"Restored {len(store.tasks)} tasks from {args.history}")
 
-            store = TaskStore("data.json")
-            store.load_tasks()
+    pipeline = TaskPipeline(workers=args.setup_workers, download_workers=args.workers)
+    # Setups a previous run didn't finish resume with their remaining stages.
+    unfinished = default_journal().unfinished_jobs()
+    if unfinished:
+        print(f"Resuming {len(unfinished)} unfinished task setups")
+    for task in unfinished:
+        pipeline.submit(task)
+    scheduler = PollScheduler()
+    try:
+        while True:
+            started = time.monotonic()
+            payload = client.get_tasks(raw=True)
+            latency = time.monotonic() - started
+            events = []
+            if payload:
+                events = store.apply_payload(payload)
+                history.set_meta("etag", client.etag)
+                print(f"Loaded {len(store.tasks)} tasks, {len(events)} changes.")
 
-            target_user_id = client.user_id
-            matching_tasks = store.filter_tasks_by_motioner(target_user_id)
+                target_user_id = client.user_id
+                changed_ids = {event.task.taskId for event in events if event.kind in SETUP_EVENTS}
+                if target_user_id is None:
+                    # Signed out mid-poll (e.g. a 401 cleared the session); nothing is ours until we know who we are.
+                    print("⚠️ No user id, skipping task matching until the next login.")
+                    changed_ids = set()
+                matching_tasks = [
+                    task for task in store.query(motioner=target_user_id, status=ACTIVE_STATUSES, by_priority=True)
+                    if task.taskId in changed_ids
+                ] if changed_ids else []
 
-            print(f"Found {len(matching_tasks)} tasks for motioner {target_user_id}")
-            for task in matching_tasks:
-                if task.status == "MOTION_TODO" or task.status == "MOTION_IN_PROCESS":
-                    print(f"💥 {task.name}")
-                    setup_new_task(task=task)
+                print(f"Found {len(matching_tasks)} new or updated active tasks for motioner {target_user_id}")
+                for task in matching_tasks:
+                    pipeline.submit(task.to_task())
 
-        # Wait a minute before next check
-        time.sleep(60)
+            scheduler.record(client.last_status, changed=bool(events), nbytes=client.last_bytes,
+                             latency=latency, retry_after=client.retry_after)
+            if payload:
+                print(f"📊 {scheduler.stats.summary()} | {http_stats.summary()}")
+            time.sleep(scheduler.next_delay())
+    except KeyboardInterrupt:
+        print("🛑 Stopping...")
+        pipeline.shutdown()
+        client.close()
+        history.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,128 @@
+# creative_names.py
+import re
+from datetime import date
+from collections import defaultdict
+from operator import attrgetter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+# Cyrillic capitals that look like Latin ones. Names typed on a Russian layout
+# carry e.g. "Сm-" or "СТА-" with a Cyrillic С/Т/А; keys and codes are folded to Latin.
+_HOMOGLYPHS = str.maketrans("АВСЕНКМОРТХаеорсх", "ABCEHKMOPTXaeopcx")
+
+_HEADER = re.compile(r"(\d{2})\.(\d{2})\.(\d{4})[- ]F-(Video|Static)")
+# Components are "_<Key>-<value>"; splitting only before a key keeps stray
+# "_and" or "_(copy)" pieces inside the previous value. Keys may be typed with
+# Cyrillic look-alikes, which the class admits and _HOMOGLYPHS folds.
+_SPLIT = re.compile(r"_+(?=[A-ZАВСЕНКМОРТХ][A-Za-zАВСЕНКМОРТХаеорсх]{0,2}\d?-)")
+_CODE = re.compile(r"([A-Z]{2,3})(?:[- ](\d{1,2}))?")
+
+# Keys also seen in the wrong case, e.g. "DE-" for "De-".
+_KEY_ALIASES = {"DE": "De", "CM": "Cm", "CO": "Co"}
+
+
+class CreativeName(NamedTuple):
+    """A parsed creative name; fields holds every component in order, keys normalised."""
+    raw: str
+    date: Optional[date]
+    format: str  # "Video" or "Static"
+    title: Optional[str]  # N-
+    co: Optional[int]
+    hook: Optional[str]  # H-, e.g. "OP-123"
+    p: Optional[int]
+    fe: Optional[int]
+    s: Optional[int]
+    cm: Optional[str]
+    de: Optional[str]
+    suffix: Optional[int]  # the trailing -NN after De
+    fields: Tuple[Tuple[str, str], ...]
+
+
+def _int(value: Optional[str]) -> Optional[int]:
+    return int(value) if value and value.isdigit() else None
+
+
+def parse_name(raw: str) -> Optional[CreativeName]:
+    """Tokenise a name like "09.01.2025 F-Video_N-eye-mark_Co-46_..._Cm-OP_De-LG". Returns None if it isn't one."""
+    header = _HEADER.match(raw)
+    if not header:
+        return None
+    day, month, year, fmt = header.groups()
+    try:
+        created = date(int(year), int(month), int(day))
+    except ValueError:
+        created = None
+
+    body = raw[header.end():]
+    fields = [component.partition("-")[::2] for component in _SPLIT.split(body)[1:]]
+    if not body.isascii():
+        fields = [(key.translate(_HOMOGLYPHS), value) for key, value in fields]
+    fields = [(_KEY_ALIASES.get(key, key), value) for key, value in fields]
+    # The first occurrence of a key wins ("N-00" late in a name is not the title).
+    first: Dict[str, str] = dict(reversed(fields))
+
+    # Designer codes: "Cm-OP", "De-LG", "De-NO-02" or "De-RM 3" (the number is the suffix).
+    cm = _CODE.match(first.get("Cm", "").translate(_HOMOGLYPHS))
+    de = _CODE.match(first.get("De", "").translate(_HOMOGLYPHS))
+    hook = first.get("H")
+    return CreativeName(
+        raw=raw,
+        date=created,
+        format=fmt,
+        title=first.get("N"),
+        co=_int(first.get("Co")),
+        hook=hook.translate(_HOMOGLYPHS) if hook else None,
+        p=_int(first.get("P")),
+        fe=_int(first.get("Fe")),
+        s=_int(first.get("S")),
+        cm=cm.group(1) if cm else None,
+        de=de.group(1) if de else None,
+        suffix=int(de.group(2)) if de and de.group(2) else None,
+        fields=tuple(fields),
+    )
+
+
+# Record attributes the index answers queries on.
+INDEXED = ("date", "format", "co", "p", "fe", "s", "cm", "de", "suffix")
+_indexed_values = attrgetter(*INDEXED)
+
+
+class CreativeIndex:
+    """
+    In-memory inverted index over parsed names: (attribute, value) -> ids.
+    query(format="Video", de="AH", co=44) intersects the posting sets,
+    smallest first. hook_designer indexes the designer part of H- ("OP" in "OP-123").
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.records: List[CreativeName] = []
+        self._postings: Dict[Tuple[str, object], Set[int]] = defaultdict(set)
+        self.skipped = 0
+        for raw in names:
+            self.add(raw)
+
+    def add(self, raw: str) -> Optional[int]:
+        record = parse_name(raw)
+        if record is None:
+            self.skipped += 1
+            return None
+        record_id = len(self.records)
+        self.records.append(record)
+        postings = self._postings
+        for attribute, value in zip(INDEXED, _indexed_values(record)):
+            if value is not None:
+                postings[(attribute, value)].add(record_id)
+        if record.hook:
+            self._postings[("hook_designer", record.hook.split("-", 1)[0])].add(record_id)
+        return record_id
+
+    def query(self, **criteria) -> List[CreativeName]:
+        """Records matching every criterion, in insertion order."""
+        if not criteria:
+            return list(self.records)
+        postings = sorted((self._postings.get(item, set()) for item in criteria.items()), key=len)
+        ids = postings[0].intersection(*postings[1:])
+        return [self.records[record_id] for record_id in sorted(ids)]
+
+    def count(self, **criteria) -> int:
+        postings = sorted((self._postings.get(item, set()) for item in criteria.items()), key=len)
+        return len(postings[0].intersection(*postings[1:])) if postings else len(self.records)
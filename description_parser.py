@@ -0,0 +1,215 @@
+# description_parser.py
+import re
+import html.entities
+from html.parser import HTMLParser
+from typing import List, NamedTuple, Optional
+from download_links import extract_names
+
+# Tags BeautifulSoup treats as empty (never pushed on the open-tag stack).
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen", "link", "menuitem", "meta",
+    "param", "source", "track", "wbr", "basefont", "bgsound", "command", "frame", "image", "isindex",
+    "nextid", "spacer",
+}
+PRESERVE_WHITESPACE_TAGS = {"pre", "textarea"}
+# Tags whose text get_text() leaves out.
+HIDDEN_TAGS = {"script", "style", "template", "rt", "rp"}
+# Only these count as whitespace when BeautifulSoup collapses blank strings (not e.g. &nbsp;).
+ASCII_SPACES = " \n\t\x0c\r"
+# What html.parser tries to read as markup after a "<" (tags, end tags, comments, declarations, PIs).
+_CONSTRUCT_START = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ/!?")
+_TAIL_OPEN = re.compile("<")
+
+
+class ParsedDescription(NamedTuple):
+    text: str  # what description_extractor writes to description.txt
+    hrefs: List[str]  # every <a href>, in document order
+    names: List[str]  # Drive folder names, as extract_download_links returns them
+
+
+class _DescriptionParser(HTMLParser):
+    """
+    Streams a description once, producing the same text as
+    BeautifulSoup(...).get_text(separator="\\n", strip=True) after every <a>
+    was replaced by "text (href)", and collecting the hrefs and Drive folder
+    names on the way. Names are looked for in the raw text of every node,
+    tag and comment, as extract_download_links looks for them in the HTML.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.lines: List[str] = []
+        self.hrefs: List[str] = []
+        self.names: List[str] = []
+        self._scanned = 0
+        self._stack: List[str] = []
+        self._data: List[str] = []
+        self._hidden = 0
+        self._link_href: Optional[str] = None
+        self._link_text: List[str] = []
+
+    # A text node ends at every markup event, like BeautifulSoup's endData().
+
+    def _end_data(self) -> None:
+        if not self._data:
+            return
+        data = "".join(self._data)
+        self._data = []
+        if self._hidden:
+            return
+        if self._link_href is not None:
+            if not data.strip(ASCII_SPACES) and not PRESERVE_WHITESPACE_TAGS.intersection(self._stack):
+                # BeautifulSoup collapses whitespace-only strings to one character.
+                data = "\n" if "\n" in data else " "
+            self._link_text.append(data)
+            return
+        data = data.strip()
+        if data:
+            self.lines.append(data)
+
+    def _scan(self, text: Optional[str]) -> None:
+        self._scanned += 1
+        if text:
+            self.names.extend(extract_names(text))
+
+    def handle_starttag(self, tag, attrs):
+        self._end_data()
+        self._scan(self.get_starttag_text())
+        if tag == "a":
+            href = dict(attrs).get("href")
+            if href is not None:
+                self.hrefs.append(href)
+            if self._link_href is None:
+                self._link_href = href or ""
+                self._link_text = []
+        if tag in VOID_TAGS:
+            return
+        self._stack.append(tag)
+        if tag in HIDDEN_TAGS:
+            self._hidden += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def parse_endtag(self, i):
+        # handle_endtag only gets the tag name, so a malformed end tag is scanned from the raw markup,
+        # unless html.parser passed it on as a comment or text (already scanned).
+        scanned = self._scanned
+        end = super().parse_endtag(i)
+        if end > i and self._scanned == scanned:
+            self._scan(self.rawdata[i:end])
+        return end
+
+    def handle_endtag(self, tag):
+        self._end_data()
+        if tag not in self._stack:
+            return
+        while self._stack:
+            closed = self._stack.pop()
+            if closed in HIDDEN_TAGS:
+                self._hidden -= 1
+            if closed == "a" and "a" not in self._stack:
+                self._end_link()
+            if closed == tag:
+                return
+
+    def _end_link(self) -> None:
+        text = "".join(self._link_text)
+        line = f"{text} ({self._link_href})" if self._link_href else text
+        self._link_href = None
+        self._link_text = []
+        line = line.strip()
+        if line:
+            self.lines.append(line)
+
+    def handle_data(self, data):
+        self._scan(data)
+        self._data.append(data)
+
+    def handle_entityref(self, name):
+        character = html.entities.html5.get(f"{name};")
+        self._data.append(character if character is not None else f"&{name}")
+
+    def handle_charref(self, name):
+        try:
+            code = int(name[1:], 16) if name[:1] in ("x", "X") else int(name)
+        except ValueError:
+            self._data.append(f"&#{name};")
+            return
+        character = None
+        if code < 256:
+            # Like browsers (and BeautifulSoup), read 128-159 as windows-1252.
+            try:
+                character = bytes([code]).decode("windows-1252")
+            except UnicodeDecodeError:
+                pass
+        if character is None:
+            try:
+                character = chr(code)
+            except (ValueError, OverflowError):
+                character = "\N{REPLACEMENT CHARACTER}"
+        self._data.append(character)
+
+    def handle_comment(self, data):
+        self._end_data()
+        self._scan(data)
+
+    def handle_decl(self, decl):
+        self._end_data()
+        self._scan(decl)
+
+    def handle_pi(self, data):
+        self._end_data()
+        self._scan(data)
+
+    def unknown_decl(self, data):
+        self._end_data()
+        self._scan(data)
+        if data.startswith("CDATA["):
+            self._data.append(data[len("CDATA["):])
+            self._end_data()
+
+    def close(self):
+        super().close()
+        # Text after an unclosed <script> or <style> is never handed to handle_data.
+        self._scan(self.rawdata)
+        self._end_data()
+        if self._link_href is not None:
+            self._end_link()
+
+
+def _escape_tail(description: str) -> str:
+    """
+    Nothing that needs a closing ">" can complete after the last one, so at
+    close() html.parser reads every "<tag", "</", "<!" or "<?" there as text
+    up to the next "<" (just "<" for the last one). It only gets there after
+    matching each against the rest of the description, which is quadratic on
+    input like "<a " * 20000. Escaping that text up front gives the same
+    result in one pass.
+    """
+    tail = description.rfind(">") + 1
+    opens = [match.start() for match in _TAIL_OPEN.finditer(description, tail)]
+    if not opens:
+        return description
+    parts = [description[:opens[0]]]
+    for pos, next_pos in zip(opens, opens[1:] + [len(description)]):
+        # A construct's text runs raw to the next "<", so its "&" is escaped too.
+        if next_pos < len(description) and description[pos + 1:pos + 2] in _CONSTRUCT_START:
+            parts.append(description[pos:next_pos].replace("&", "&amp;").replace("<", "&lt;"))
+        else:
+            parts.append("&lt;" + description[pos + 1:next_pos])
+    return "".join(parts)
+
+
+def parse_description(description: Optional[str]) -> ParsedDescription:
+    """
+    Parse a task description once and return its formatted text, link
+    targets and Drive folder names together, so setup stages don't each
+    re-parse the HTML. A missing (None) description parses as empty.
+    """
+    parser = _DescriptionParser()
+    parser.feed(_escape_tail(description or ""))
+    parser.close()
+    return ParsedDescription("\n".join(parser.lines), parser.hrefs, parser.names)
@@ -1,23 +1,17 @@
 # download_links.py
 import re
-from typing import List
+import html
+from typing import List, NamedTuple
 
 # Updated Regex Pattern:
 # DOWNLOAD_PATTERN = r"(\d{2}\.\d{2}\.\d{4} (?:F-(?:Video|Static))_N-[\w\+\-()]+(?:_[\w\+\-()]*)*_Co-\d{2,3}.*?(?:_Cm-[A-Z]{2,3})?_De-[A-Z]{2,3}(?:-\d{1,2})?)"
 DOWNLOAD_PATTERN = r"(\d{2}\.\d{2}\.\d{4} (?:F-(?:Video|Static))_N-[\w\+\-()]+(?:_[\w\+\-()]*)*_Co-\d{2,3}.*?(?:_Cm-[A-Z]{2,3})?_De-[A-Z]{2,3})(?:-\d{1,2})?"
 
-def extract_download_links(description: str) -> List[str]:
-    """
-    Parse the task description text and extract download folder names matching the pattern.
-    
-    Args:
-        description (str): The task's description text.
-        
-    Returns:
-        List[str]: A list of matched download link strings.
-    """
-    # return re.findall(DOWNLOAD_PATTERN, description)
-    pattern = r'''
+# The pattern extract_download_links used to run. Its nested quantifier
+# `(?:_[-\w\+]+)+` backtracks through every split of a long near-miss name;
+# it is kept as the reference the scanner below is checked against
+# (benchmarks/bench_link_extractor.py).
+LEGACY_PATTERN = r'''
     (\d{2}\.\d{2}\.\d{4})  # Date (DD.MM.YYYY)
     [- ]                    # Hyphen/space separator
     (F-(?:Video|Static)     # F-Video/F-Static
@@ -26,6 +20,144 @@ def extract_download_links(description: str) -> List[str]:
     )                       # End main pattern
     (?:-\d{1,2})?           # Optional numeric suffix
     '''
-    
-    matches = re.findall(pattern, description, re.VERBOSE)
-    return [f"{date} {rest}" for date, rest in matches]
\ No newline at end of file
+
+# One left-to-right scan finds both name prefixes and <a tags. The name body
+# after the prefix is a single run of [-\w+] characters, measured with
+# _NAME_RUN and searched for its last "_De-XX" with rfind, so nothing is ever
+# backtracked. An <a tag's href is looked up with _HREF_NAME/_HREF_VALUE from
+# a cursor that only moves forward (see _Hrefs), so unterminated tags don't
+# rescan the rest of the text.
+_SCAN = re.compile(
+    r"(?P<date>\d{2}\.\d{2}\.\d{4})[- ](?P<format>F-(?:Video|Static))"
+    r"|(?i:<a\b)"
+)
+_NAME_PREFIX = re.compile(r"(?P<date>\d{2}\.\d{2}\.\d{4})[- ](?P<format>F-(?:Video|Static))")
+_HREF_NAME = re.compile(r"\bhref\s*=\s*", re.IGNORECASE)
+_HREF_VALUE = re.compile(r"\"(?P<dq>[^\"]*)\"|'(?P<sq>[^']*)'|(?P<bare>[^\s\"'>]+)")
+_NAME_RUN = re.compile(r"[-\w+]*")
+_NAME_SUFFIX = re.compile(r"-\d{1,2}")
+_UPPER = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+
+
+class DescriptionLinks(NamedTuple):
+    names: List[str]  # Drive folder names, as extract_download_links returns them
+    hrefs: List[str]  # <a href> values, entity-decoded, in document order
+
+
+def _name_end(text: str, body: int) -> tuple:
+    """
+    For a name whose body (the "_..." part after F-Video/F-Static) starts at
+    `body`, return (end of the name, end including any -NN suffix), or None
+    if there is no "_De-XX" in it. Mirrors LEGACY_PATTERN: the last "_De-"
+    followed by 2-3 capitals, with at least one "_x" component before it.
+    """
+    if not text.startswith("_", body):
+        return None
+    run_end = _NAME_RUN.match(text, body).end()
+    pos = run_end
+    while True:
+        pos = text.rfind("_De-", body + 2, pos)
+        if pos < 0:
+            return None
+        code = pos + 4
+        if code + 2 <= run_end and text[code] in _UPPER and text[code + 1] in _UPPER:
+            end = code + 3 if code + 2 < run_end and text[code + 2] in _UPPER else code + 2
+            suffix = _NAME_SUFFIX.match(text, end)
+            return end, suffix.end() if suffix else end
+        # rfind's end bound excludes matches that start at or after it, so keep searching leftwards.
+        pos += 3
+
+
+def _take_name(text: str, match, names: List[str]) -> int:
+    """Append the name a date/format prefix match starts, if any; returns where scanning resumes."""
+    ends = _name_end(text, match.end())
+    if not ends:
+        return match.start() + 1
+    names.append(f"{match.group('date')} {match.group('format')}{text[match.end():ends[0]]}")
+    return ends[1]
+
+
+class _Hrefs:
+    """
+    The href of each <a tag in a text, for tags found left to right. The
+    next ">" and the next well-formed href attribute are cached and only
+    searched for again once a tag starts past them, so every character is
+    scanned a bounded number of times however many tags never close.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self._close = -1  # the first ">" at or after the last tag looked up
+        self._attr = None  # (name match, value match) of the next href, None once there are no more
+        self._searched = False
+
+    def _next_attr(self, pos: int):
+        text = self.text
+        name = _HREF_NAME.search(text, pos)
+        while name:
+            value = _HREF_VALUE.match(text, name.end())
+            if value:
+                return name, value
+            name = _HREF_NAME.search(text, name.start() + 1)
+        return None
+
+    def find(self, tag: int):
+        """The href value match of the <a tag starting at `tag`, or None if it has none."""
+        if self._close < tag:
+            self._close = self.text.find(">", tag)
+            if self._close < 0:
+                self._close = len(self.text)
+        if not self._searched or self._attr is not None and self._attr[0].start() < tag + 2:
+            self._attr = self._next_attr(tag + 2)
+            self._searched = True
+        # Like <a\b[^>]*?\bhref=: the attribute has to start before the tag's first ">".
+        if self._attr is None or self._attr[0].start() >= self._close:
+            return None
+        return self._attr[1]
+
+
+def extract_links(description: str) -> DescriptionLinks:
+    """Pull Drive folder names and link targets out of a description in a single linear pass."""
+    names = []
+    hrefs = []
+    tags = _Hrefs(description)
+    pos = 0
+    while True:
+        match = _SCAN.search(description, pos)
+        if not match:
+            return DescriptionLinks(names, hrefs)
+        if match.group("date"):
+            pos = _take_name(description, match, names)
+            continue
+        value = tags.find(match.start())
+        if value is None:
+            pos = match.end()
+            continue
+        group = "dq" if value.group("dq") is not None else "sq" if value.group("sq") is not None else "bare"
+        hrefs.append(html.unescape(value.group(group)))
+        # Carry on from inside the value, so names that appear in URLs are still found.
+        pos = value.start(group)
+
+
+def extract_names(text: str) -> List[str]:
+    """Drive folder names in a string without markup, e.g. one text node or attribute value of a parsed description."""
+    names = []
+    pos = 0
+    while True:
+        match = _NAME_PREFIX.search(text, pos)
+        if not match:
+            return names
+        pos = _take_name(text, match, names)
+
+
+def extract_download_links(description: str) -> List[str]:
+    """
+    Parse the task description text and extract download folder names matching the pattern.
+
+    Args:
+        description (str): The task's description text.
+
+    Returns:
+        List[str]: A list of matched download link strings.
+    """
+    return extract_links(description).names
@@ -0,0 +1,103 @@
+# drive_client.py
+import os
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from dotenv import load_dotenv
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build_from_document
+from google.oauth2.credentials import Credentials
+from google_auth_oauthlib.flow import InstalledAppFlow
+from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
+
+from transport import RequestsHttp, new_session
+
+load_dotenv()
+
+# Define OAuth SCOPES
+SCOPES = ["https://www.googleapis.com/auth/drive"]
+# Credentials are refreshed this many seconds before they expire.
+DRIVE_REFRESH_MARGIN = int(os.getenv("DRIVE_REFRESH_MARGIN", 300))
+
+
+class DriveClientProvider:
+    """
+    Long-lived source of Drive services. Credentials are read from
+    token_file once, kept in memory and refreshed (and written back) ahead of
+    expiry; the static discovery document is parsed once; every thread gets
+    its own service and AuthorizedHttp, all on the shared connection pools.
+    Safe to share between threads.
+    """
+
+    def __init__(self, token_file: str = "token.json", client_secrets: str = "credentials.json",
+                 refresh_margin: int = DRIVE_REFRESH_MARGIN):
+        self.token_file = token_file
+        self.client_secrets = client_secrets
+        self.refresh_margin = timedelta(seconds=refresh_margin)
+        self.refreshes = 0
+        self._lock = threading.Lock()
+        self._creds: Optional[Credentials] = None
+        self._document: Optional[dict] = None
+        self._local = threading.local()
+
+    def _due(self) -> bool:
+        if not self._creds.valid:
+            return True
+        # google-auth keeps expiry as naive UTC.
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return self._creds.expiry is not None and self._creds.expiry - self.refresh_margin <= now
+
+    def credentials(self) -> Credentials:
+        """The cached credentials, refreshed first if they expire within refresh_margin."""
+        with self._lock:
+            if self._creds is None and os.path.exists(self.token_file):
+                self._creds = Credentials.from_authorized_user_file(self.token_file, SCOPES)
+            if self._creds is not None and not self._due():
+                return self._creds
+            if self._creds is not None and self._creds.refresh_token:
+                # Refreshed in place, so every thread's AuthorizedHttp picks up the new token.
+                self._creds.refresh(Request(session=new_session()))
+            else:
+                flow = InstalledAppFlow.from_client_secrets_file(self.client_secrets, SCOPES)
+                self._creds = flow.run_local_server(port=0)
+            self.refreshes += 1
+            with open(self.token_file, "w") as token_file:
+                token_file.write(self._creds.to_json())
+            return self._creds
+
+    def _discovery(self) -> dict:
+        with self._lock:
+            if self._document is None:
+                self._document = json.loads(discovery_cache.get_static_doc("drive", "v3"))
+            return self._document
+
+    def service(self):
+        """This thread's Drive service, with credentials good for at least refresh_margin."""
+        creds = self.credentials()
+        local = self._local
+        # A new login replaces the credentials object; services built on the old one are dropped.
+        if getattr(local, "creds", None) is not creds:
+            local.http = AuthorizedHttp(creds, http=RequestsHttp())
+            local.service = build_from_document(self._discovery(), http=local.http)
+            local.creds = creds
+        return local.service
+
+    def http(self) -> AuthorizedHttp:
+        """This thread's authorized http, e.g. for request.execute(http=...)."""
+        self.service()
+        return self._local.http
+
+
+_provider: Optional[DriveClientProvider] = None
+_provider_lock = threading.Lock()
+
+
+def default_drive() -> DriveClientProvider:
+    """The process-wide provider for token.json / credentials.json in the working directory."""
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            _provider = DriveClientProvider()
+        return _provider
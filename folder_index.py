@@ -0,0 +1,84 @@
+# folder_index.py
+import os
+import json
+import time
+import tempfile
+import threading
+from typing import Dict, Optional
+
+# How long a resolved folder name is trusted before Drive is searched again.
+FOLDER_INDEX_TTL = int(os.getenv("FOLDER_INDEX_TTL", 7 * 24 * 3600))
+
+class FolderIndex:
+    """
+    Persistent name → Drive folder ID index, so folder names resolved once are
+    not searched for again across polls and restarts.
+    Entries expire after `ttl` seconds and are dropped when Drive answers 404
+    for their ID.
+    """
+
+    def __init__(self, filename: str = "folder_index.json", ttl: int = FOLDER_INDEX_TTL):
+        self.filename = filename
+        self.ttl = ttl
+        self.entries: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.load()
+
+    def load(self) -> None:
+        """Load the index from disk; a missing or corrupt file starts an empty index."""
+        if not os.path.exists(self.filename):
+            return
+        try:
+            with open(self.filename, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Folder index load failed: {e}")
+            self.entries = {}
+
+    def get(self, name: str) -> Optional[str]:
+        """Return the cached folder ID for name, or None if unknown or expired."""
+        entry = self.entries.get(name)
+        if not entry or time.time() - entry["resolved"] > self.ttl:
+            return None
+        return entry["id"]
+
+    def put(self, name: str, folder_id: str) -> None:
+        with self._lock:
+            self.entries[name] = {"id": folder_id, "resolved": time.time()}
+            self._dirty = True
+
+    def invalidate(self, name: str) -> None:
+        """Forget a name, e.g. after Drive returned 404 for its cached ID."""
+        with self._lock:
+            if self.entries.pop(name, None) is not None:
+                self._dirty = True
+
+    def save(self) -> None:
+        """Write the index atomically if anything changed since the last save."""
+        with self._lock:
+            if not self._dirty:
+                return
+            # A temp name of its own, so another process saving the same index can't interleave with this one.
+            fd, tmp_name = tempfile.mkstemp(prefix=".folder_index.", dir=os.path.dirname(self.filename) or ".")
+            try:
+                with open(fd, "w", encoding="utf-8") as f:
+                    json.dump(self.entries, f, ensure_ascii=False)
+                os.replace(tmp_name, self.filename)
+            except BaseException:
+                os.remove(tmp_name)
+                raise
+            self._dirty = False
+
+
+_index: Optional[FolderIndex] = None
+_index_lock = threading.Lock()
+
+
+def default_index() -> FolderIndex:
+    """The process-wide index at FOLDER_INDEX_FILE (default folder_index.json), shared by parallel setups."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = FolderIndex(os.getenv("FOLDER_INDEX_FILE", "folder_index.json"))
+        return _index
@@ -1,57 +1,179 @@
 #!/usr/bin/env python
 import os
 import io
-import zipfile
+import json
+import hashlib
 import subprocess
 import argparse
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from tqdm import tqdm
 
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
+from asset_store import default_store
+from folder_index import default_index
+from zip_packager import ZipPackager
+
+# googleapiclient, google-auth, httplib2, requests (transport) and tqdm are
+# imported where they are first needed, so `gd.py --help` and importing gd
+# stay fast; see benchmarks/bench_import_time.py.
 
 # Load environment variables from .env (ensure TASKFOLDERPASS is defined there)
 load_dotenv()
 
-# Define OAuth SCOPES
-SCOPES = ["https://www.googleapis.com/auth/drive"]
-
 def authenticate():
-    """Authenticate with Google Drive using OAuth."""
-    creds = None
-    if os.path.exists("token.json"):
-        creds = Credentials.from_authorized_user_file("token.json", SCOPES)
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
+    """Authenticate with Google Drive using OAuth (credentials are cached, see drive_client)."""
+    from drive_client import default_drive
+    return default_drive().credentials()
+
+# Name clauses OR-ed into a single search; keeps the q parameter well under Drive's length limit.
+NAME_QUERY_BATCH = 20
+
+def _quote(value):
+    """Escape a value for use inside a single-quoted Drive query string."""
+    return value.replace("\\", "\\\\").replace("'", "\\'")
+
+def resolve_folder_ids(service, folder_names, index=None):
+    """
+    Resolve many folder names to Drive IDs with as few searches as possible.
+    Names cached in index are answered locally; the rest are searched for
+    NAME_QUERY_BATCH at a time with OR-combined name clauses, all in one
+    Drive batch request, and the results are written back to the index.
+    Returns {name: folder_id}; names that were not found, or whose search
+    failed, are left out.
+    """
+    resolved = {}
+    missing = []
+    for name in dict.fromkeys(folder_names):
+        folder_id = index.get(name) if index else None
+        if folder_id:
+            resolved[name] = folder_id
         else:
-            flow = InstalledAppFlow.from_client_secrets_file("credentials.json", SCOPES)
-            creds = flow.run_local_server(port=0)
-        with open("token.json", "w") as token_file:
-            token_file.write(creds.to_json())
-    return creds
+            missing.append(name)
+
+    queries = {}
+    for i in range(0, len(missing), NAME_QUERY_BATCH):
+        clauses = " or ".join(f"name = '{_quote(name)}'" for name in missing[i:i + NAME_QUERY_BATCH])
+        queries[i] = f"({clauses}) and mimeType = '{FOLDER_MIME_TYPE}' and trashed = false"
+    found, errors = list_pages(service, queries, fields="nextPageToken, files(id, name)")
+    for i, error in errors.items():
+        print(f"⚠️ Folder search failed for {len(missing[i:i + NAME_QUERY_BATCH])} names: {error}")
+    for i in queries:
+        for folder in found.get(i, []):
+            # Like a single-name search, the first match wins when names are duplicated.
+            if folder["name"] not in resolved:
+                resolved[folder["name"]] = folder["id"]
+                if index:
+                    index.put(folder["name"], folder["id"])
+
+    if index:
+        index.save()
+    return resolved
 
-def get_folder_id(service, folder_name):
+def get_folder_id(service, folder_name, index=None):
     """Find a folder by name on Google Drive and return its ID."""
-    query = f"name = '{folder_name}' and mimeType = 'application/vnd.google-apps.folder' and trashed = false"
-    results = service.files().list(q=query, fields="files(id, name)").execute()
-    folders = results.get("files", [])
-    if not folders:
+    folder_id = resolve_folder_ids(service, [folder_name], index).get(folder_name)
+    if not folder_id:
         print(f"Folder '{folder_name}' not found.")
         return None
-    folder_id = folders[0]["id"]
     print(f"🗂 Found folder: {folder_name} (ID: {folder_id})")
     return folder_id
 
+# Only the fields the manifest needs; Drive returns much more by default.
+LIST_FIELDS = "nextPageToken, files(id, name, mimeType, size, md5Checksum, modifiedTime)"
+LIST_PAGE_SIZE = 1000
+
+# Drive accepts at most this many calls in one batch request.
+BATCH_LIMIT = 100
+BATCH_RETRIES = 3
+
+def execute_batch(service, requests, retries=BATCH_RETRIES):
+    """
+    Send {key: HttpRequest} to Drive as batch requests of up to BATCH_LIMIT
+    calls each, one round-trip per batch. Items fail on their own: returns
+    (responses, errors), {key: response} and {key: HttpError}. Items, or
+    whole batches, that fail with a retryable status go again in a later
+    batch, with backoff.
+    """
+    responses, errors = {}, {}
+    pending = list(requests.items())
+    for attempt in range(retries + 1):
+        retry = []
+        for start in range(0, len(pending), BATCH_LIMIT):
+            chunk = pending[start:start + BATCH_LIMIT]
+
+            def callback(request_id, response, exception, chunk=chunk):
+                key, request = chunk[int(request_id)]
+                if exception is None:
+                    responses[key] = response
+                elif attempt < retries and _is_retryable(exception):
+                    retry.append((key, request))
+                else:
+                    errors[key] = exception
+
+            batch = service.new_batch_http_request(callback=callback)
+            for n, (_, request) in enumerate(chunk):
+                batch.add(request, request_id=str(n))
+            try:
+                batch.execute()
+            except Exception as e:
+                if attempt == retries or not _is_retryable(e):
+                    raise
+                retry.extend(chunk)
+        if not retry:
+            break
+        time.sleep(2 ** attempt)
+        pending = retry
+    return responses, errors
+
+def list_pages(service, queries, fields=None):
+    """
+    Run {key: q} file searches together, following every result page; each
+    round of pages goes out as Drive batch requests.
+    Returns ({key: [files]}, {key: HttpError}); a failed search is left out of the first.
+    """
+    found = {key: [] for key in queries}
+    errors = {}
+    tokens = dict.fromkeys(queries)
+    while tokens:
+        requests = {
+            key: service.files().list(q=queries[key], fields=fields or LIST_FIELDS, pageSize=LIST_PAGE_SIZE,
+                                      pageToken=token)
+            for key, token in tokens.items()
+        }
+        responses, failed = execute_batch(service, requests)
+        errors.update(failed)
+        tokens = {}
+        for key, results in responses.items():
+            found[key].extend(results.get("files", []))
+            if results.get("nextPageToken"):
+                tokens[key] = results["nextPageToken"]
+    for key in errors:
+        found.pop(key, None)
+    return found, errors
+
+def list_folders_contents(service, folder_ids):
+    """List the children of many folders at once. Returns ({folder_id: [items]}, {folder_id: HttpError})."""
+    return list_pages(service, {folder_id: f"'{folder_id}' in parents and trashed = false" for folder_id in folder_ids})
+
 def list_folder_contents(service, folder_id):
-    """Return list of files/subfolders in a given folder ID."""
+    """Return list of files/subfolders in a given folder ID, following every result page."""
     query = f"'{folder_id}' in parents and trashed = false"
-    results = service.files().list(q=query, fields="files(id, name, mimeType)").execute()
-    return results.get("files", [])
+    items = []
+    page_token = None
+    while True:
+        results = service.files().list(
+            q=query, fields=LIST_FIELDS, pageSize=LIST_PAGE_SIZE, pageToken=page_token
+        ).execute()
+        items.extend(results.get("files", []))
+        page_token = results.get("nextPageToken")
+        if not page_token:
+            return items
+
+def get_files_metadata(service, file_ids, fields="id, name, mimeType, trashed, size, md5Checksum, modifiedTime"):
+    """Fetch metadata for many files in Drive batch requests. Returns ({file_id: metadata}, {file_id: HttpError})."""
+    return execute_batch(service, {file_id: service.files().get(fileId=file_id, fields=fields)
+                                   for file_id in dict.fromkeys(file_ids)})
 
 # Define export mime types for Google Docs items
 EXPORT_MIME_TYPES = {
@@ -61,108 +183,430 @@ EXPORT_MIME_TYPES = {
     "application/vnd.google-apps.drawing": "image/png",
 }
 
-def download_file(service, file_id, file_name, save_path, mime_type, chunk_size=1024*1024):
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+DOWNLOAD_CHUNK_SIZE = 1024*1024*16
+# Unfinished downloads live next to their target under this suffix until verified.
+PART_SUFFIX = ".part"
+DOWNLOAD_RETRIES = 3
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+def _iter_media(request, start, chunk_size):
+    """
+    Yield the bytes of a media request from offset start onwards, one HTTP
+    Range request per chunk, until the size reported by Content-Range is reached.
+    """
+    from googleapiclient.errors import HttpError
+    total = None
+    while total is None or start < total:
+        headers = dict(request.headers)
+        headers["range"] = f"bytes={start}-{start + chunk_size - 1}"
+        resp, content = request.http.request(request.uri, "GET", headers=headers)
+        if resp.status == 206:
+            total = int(resp["content-range"].rsplit("/", 1)[1])
+        elif resp.status == 200:
+            # Range was ignored and the whole file came back; drop what we already have.
+            yield content[start:]
+            return
+        elif resp.status == 416:
+            total = int(resp["content-range"].rsplit("/", 1)[1])
+            if start >= total:
+                return
+            raise HttpError(resp, content, uri=request.uri)
+        else:
+            raise HttpError(resp, content, uri=request.uri)
+        if not content:
+            raise IOError(f"Empty chunk at byte {start} of {total}")
+        start += len(content)
+        yield content
+
+def _is_retryable(error):
+    import httplib2
+    from googleapiclient.errors import HttpError
+    if isinstance(error, HttpError):
+        return error.resp.status in RETRYABLE_STATUSES
+    return isinstance(error, (OSError, httplib2.HttpLib2Error))
+
+def _export_file(service, file_id, part_path, mime_type, chunk_size, progress):
+    """Export a Google Docs item to part_path. Exports have no size/MD5 and cannot be resumed."""
+    from googleapiclient.http import MediaIoBaseDownload
+    export_mime = EXPORT_MIME_TYPES[mime_type]
+    request = service.files().export_media(fileId=file_id, mimeType=export_mime)
+    with open(part_path, "wb") as f:
+        downloader = MediaIoBaseDownload(f, request, chunksize=chunk_size)
+        done = False
+        received = 0
+        while not done:
+            status, done = downloader.next_chunk()
+            if progress and status:
+                progress(status.resumable_progress - received)
+                received = status.resumable_progress
+
+def download_file(service, file_id, file_name, save_path, mime_type, chunk_size=1024*1024, progress=None,
+                  size=None, md5=None):
     """
     Download a single file from Google Drive.
     If the file is a Google Docs type, export it in a corresponding format.
+    Bytes are written to save_path + PART_SUFFIX. A part file left by an
+    interrupted run is resumed from its length with HTTP Range requests, and
+    the MD5 is computed while streaming. The file is renamed into place only
+    once it matches the size/md5 Drive reported.
+    If given, progress(n) is called with the number of bytes received per chunk.
     """
-    # Check if file already exists:
-    if os.path.exists(save_path):
-        print(f"✅ File already exists, skipping: {file_name}")
-        return True
-
+    part_path = f"{save_path}{PART_SUFFIX}"
     try:
+        os.makedirs(os.path.dirname(save_path), exist_ok=True)
         if mime_type in EXPORT_MIME_TYPES:
-            export_mime = EXPORT_MIME_TYPES[mime_type]
-            request = service.files().export_media(fileId=file_id, mimeType=export_mime)
-            file_extension = export_mime.split("/")[-1]
-            file_name = f"{file_name}.{file_extension}"
-        else:
-            request = service.files().get_media(fileId=file_id)
+            _export_file(service, file_id, part_path, mime_type, chunk_size, progress)
+            os.replace(part_path, save_path)
+            return True
 
-        os.makedirs(os.path.dirname(save_path), exist_ok=True)
-        with open(save_path, "wb") as f:
-            downloader = MediaIoBaseDownload(f, request, chunksize=chunk_size)
-            done = False
-            while not done:
-                status, done = downloader.next_chunk()
-                # Not printing per-chunk progress to keep things simple.
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        if size is not None and offset > size:
+            offset = 0
+        digest = hashlib.md5()
+        if offset:
+            print(f"↩️ Resuming {file_name} at {offset / 1024**2:.1f} MB")
+            # The digest has to cover the kept prefix too; this is the only re-read.
+            with open(part_path, "rb") as f:
+                for block in iter(lambda: f.read(chunk_size), b""):
+                    digest.update(block)
+            if progress:
+                progress(offset)
+
+        request = service.files().get_media(fileId=file_id)
+        with open(part_path, "r+b" if offset else "wb") as f:
+            f.seek(offset)
+            f.truncate()
+            for attempt in range(DOWNLOAD_RETRIES + 1):
+                try:
+                    for chunk in _iter_media(request, offset, chunk_size):
+                        f.write(chunk)
+                        digest.update(chunk)
+                        offset += len(chunk)
+                        if progress:
+                            progress(len(chunk))
+                    break
+                except Exception as e:
+                    if attempt == DOWNLOAD_RETRIES or not _is_retryable(e):
+                        raise
+                    print(f"⚠️ {file_name}: {e}, retrying from byte {offset}")
+                    time.sleep(2 ** attempt)
+
+        if (size is not None and offset != size) or (md5 and digest.hexdigest() != md5):
+            print(f"❌ Verification failed for {file_name}: got {offset} bytes, md5 {digest.hexdigest()}")
+            os.remove(part_path)
+            return False
+        os.replace(part_path, save_path)
         return True
     except Exception as e:
         print(f"Error downloading {file_name}: {e}")
         return False
 
-def count_files(service, folder_id):
+def build_manifest(service, folder_id, local_path):
     """
-    Recursively count the number of files (non-folders) in the given folder.
+    Walk the folder tree once and return a flat list of every file in it.
+    Each entry is the Drive metadata (id, name, mimeType, size, md5Checksum,
+    modifiedTime) plus "path", the local save path. Google Docs items get the
+    extension of the format they are exported to.
+    The tree is walked a level at a time: every folder on a level is listed
+    in the same batch requests, so a wide tree costs one round-trip per level.
     """
-    total = 0
-    items = list_folder_contents(service, folder_id)
-    for item in items:
-        if item["mimeType"] == "application/vnd.google-apps.folder":
-            total += count_files(service, item["id"])
-        else:
-            total += 1
-    return total
+    manifest = []
+    level = {folder_id: local_path}
+    while level:
+        contents, errors = list_folders_contents(service, level)
+        if errors:
+            raise next(iter(errors.values()))
+        next_level = {}
+        for parent_id, parent_path in level.items():
+            for item in contents[parent_id]:
+                item_path = os.path.join(parent_path, item["name"])
+                if item["mimeType"] == FOLDER_MIME_TYPE:
+                    next_level[item["id"]] = item_path
+                    continue
+                if item["mimeType"] in EXPORT_MIME_TYPES:
+                    item_path = f"{item_path}.{EXPORT_MIME_TYPES[item['mimeType']].split('/')[-1]}"
+                manifest.append({**item, "path": item_path})
+        level = next_level
+    return manifest
+
+def manifest_size(manifest):
+    """Total size in bytes of the manifest entries (exported Docs items have no size)."""
+    return sum(int(entry.get("size", 0)) for entry in manifest)
+
+def is_downloaded(entry):
+    """A manifest entry counts as downloaded when its file exists with the size Drive reports."""
+    try:
+        local_size = os.path.getsize(entry["path"])
+    except OSError:
+        return False
+    return "size" not in entry or local_size == int(entry["size"])
+
+# Per-folder record of what was downloaded, used by sync mode.
+SYNC_STATE_FILE = ".drive_manifest.json"
 
-def download_folder_sequential(service, folder_id, local_path, pbar):
+def load_sync_state(local_path):
+    """Return {file_id: {modifiedTime, md5Checksum, path}} recorded by the last download of local_path."""
+    state_path = os.path.join(local_path, SYNC_STATE_FILE)
+    if not os.path.exists(state_path):
+        return {}
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Ignoring unreadable {state_path}: {e}")
+        return {}
+
+def save_sync_state(local_path, state):
+    """Atomically write the sync state of local_path."""
+    state_path = os.path.join(local_path, SYNC_STATE_FILE)
+    with open(f"{state_path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(f"{state_path}.tmp", state_path)
+
+def _sync_record(entry, local_path):
+    return {
+        "modifiedTime": entry.get("modifiedTime"),
+        "md5Checksum": entry.get("md5Checksum"),
+        "path": os.path.relpath(entry["path"], local_path),
+    }
+
+def is_unchanged(entry, state, local_path):
+    """
+    Sync-mode skip check: a file recorded in state is current when its
+    modifiedTime, md5 and path still match Drive and the local copy is still
+    there with Drive's size (one stat, no hashing), so a file deleted or cut
+    short since the last sync is fetched again.
+    Files the state does not know about fall back to is_downloaded.
     """
-    Recursively download the contents of a folder sequentially.
-    Each file download updates the overall progress bar.
-    Skips files that already exist.
+    known = state.get(entry["id"])
+    if known is None:
+        return is_downloaded(entry)
+    return (known["modifiedTime"] == entry.get("modifiedTime")
+            and known["md5Checksum"] == entry.get("md5Checksum")
+            and known["path"] == os.path.relpath(entry["path"], local_path)
+            and is_downloaded(entry))
+
+def download_manifest(service_factory, manifest, workers=1, skip=is_downloaded, on_file=None):
     """
-    os.makedirs(local_path, exist_ok=True)
-    items = list_folder_contents(service, folder_id)
-    for item in items:
-        item_path = os.path.join(local_path, item["name"])
-        if item["mimeType"] == "application/vnd.google-apps.folder":
-            download_folder_sequential(service, item["id"], item_path, pbar)
+    Download every manifest entry for which skip(entry) is false; by default,
+    every entry that is not already on disk. on_file(entry) is called from the
+    worker thread as soon as an entry has been downloaded and verified.
+    With workers > 1 files are fetched by a bounded pool of threads; googleapiclient
+    services are not thread-safe, so every worker builds its own through
+    service_factory(). A single progress bar tracks bytes, with the finished
+    file count shown alongside.
+    Returns the list of entries that failed to download.
+    """
+    from tqdm import tqdm
+
+    pending = [entry for entry in manifest if not skip(entry)]
+    print(f"Total files: {len(manifest)} ({manifest_size(manifest) / 1024**2:.1f} MB), "
+          f"up to date: {len(manifest) - len(pending)}")
+
+    local = threading.local()
+    lock = threading.Lock()
+    finished = 0
+    failed = []
+
+    def worker_service():
+        if not hasattr(local, "service"):
+            local.service = service_factory()
+        return local.service
+
+    with tqdm(total=manifest_size(pending), desc="Overall Download Progress", unit="B", unit_scale=True, unit_divisor=1024) as pbar:
+        pbar.set_postfix(files=f"0/{len(pending)}")
+
+        def update_bytes(n):
+            with lock:
+                pbar.update(n)
+
+        def download(entry):
+            nonlocal finished
+            ok = download_file(worker_service(), entry["id"], entry["name"], entry["path"], entry["mimeType"],
+                               chunk_size=DOWNLOAD_CHUNK_SIZE, progress=update_bytes,
+                               size=int(entry["size"]) if "size" in entry else None,
+                               md5=entry.get("md5Checksum"))
+            if ok and on_file:
+                on_file(entry)
+            with lock:
+                finished += 1
+                if not ok:
+                    failed.append(entry)
+                pbar.set_postfix(files=f"{finished}/{len(pending)}")
+
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(download, pending))
         else:
-            download_file(service, item["id"], item["name"], item_path, item["mimeType"], chunk_size=1024*1024*16)  # e.g., using 2 MB chunks
-            pbar.update(1)
-    return
-
-def zip_folder(folder_path):
-    """Zip the folder into a .zip archive."""
-    zip_name = f"{folder_path}.zip"
-    with zipfile.ZipFile(zip_name, "w", zipfile.ZIP_DEFLATED) as zipf:
+            for entry in pending:
+                download(entry)
+
+    return failed
+
+def zip_folder(folder_path, workers=None, verify=True):
+    """
+    Zip the folder into a .zip archive. Already-compressed media is stored,
+    everything else is deflated; `workers` threads read and queue the files.
+    With verify, the finished archive is checked with testzip.
+    """
+    with ZipPackager(folder_path, workers=workers, verify=verify) as packager:
         for root, _, files in os.walk(folder_path):
             for file in files:
-                file_path = os.path.join(root, file)
-                arcname = os.path.relpath(file_path, start=os.path.dirname(folder_path))
-                zipf.write(file_path, arcname)
-    print(f"📦 Folder zipped: {zip_name}")
-    return zip_name
+                if file.endswith(PART_SUFFIX) or file == SYNC_STATE_FILE:
+                    continue
+                packager.add(os.path.join(root, file))
+    return packager.zip_name
+
+def asset_key(entry):
+    """AssetStore key for a manifest entry: its md5, or id + modifiedTime for exported Docs items."""
+    if entry.get("md5Checksum"):
+        return f"md5-{entry['md5Checksum']}"
+    return f"drive-{entry['id']}-{entry.get('modifiedTime', '').replace(':', '')}"
+
+def download_to_folder(service_factory, manifest, local_folder_path, workers=1, sync=False, packager=None,
+                       store=None):
+    """
+    Download a folder's manifest into local_folder_path and record the result
+    in its SYNC_STATE_FILE. With an AssetStore, files the store already holds
+    are linked in instead of downloaded, and new downloads are added to it.
+    With a ZipPackager, files already on disk are queued for the archive
+    right away and the rest as each one finishes.
+    Returns the entries that failed to download.
+    """
+    state = load_sync_state(local_folder_path)
+    if sync:
+        skip = lambda entry: is_unchanged(entry, state, local_folder_path)
+    else:
+        skip = is_downloaded
+    skipped = {entry["id"] for entry in manifest if skip(entry)}
+
+    linked = set()
+    if store:
+        for entry in manifest:
+            if entry["id"] not in skipped and store.link_into(asset_key(entry), entry["path"]):
+                linked.add(entry["id"])
+        if linked:
+            print(f"🔗 Linked {len(linked)} files from the asset store")
 
-def main_downloader(target_folder_name: str, download_path: str = None):
+    def on_file(entry):
+        if store:
+            store.ingest(entry["path"], asset_key(entry))
+        if packager:
+            packager.add(entry["path"])
+
+    if packager:
+        for entry in manifest:
+            if entry["id"] in skipped or entry["id"] in linked:
+                packager.add(entry["path"])
+    failed = download_manifest(service_factory, manifest, workers=workers,
+                               skip=lambda entry: entry["id"] in skipped or entry["id"] in linked,
+                               on_file=on_file)
+
+    failed_ids = {entry["id"] for entry in failed}
+    new_state = {}
+    for entry in manifest:
+        if entry["id"] in failed_ids:
+            continue
+        # A file skipped only because it exists keeps its old record, so a later sync still sees it as stale.
+        if not sync and entry["id"] in skipped and entry["id"] in state:
+            new_state[entry["id"]] = state[entry["id"]]
+        else:
+            new_state[entry["id"]] = _sync_record(entry, local_folder_path)
+    save_sync_state(local_folder_path, new_state)
+    return failed
+
+def download_folders(folder_names, download_path: str = None, workers: int = 1, sync: bool = False,
+                     make_zip: bool = False):
     """
-    Authenticate, locate the target folder on Drive, count total files,
-    download all files sequentially with a single overall progress bar, and zip the folder.
-    Skips files that are already downloaded.
+    Take this thread's Drive service from the process-wide DriveClientProvider
+    (credentials cached in memory, nothing rebuilt per call), resolve all
+    folder names in a single batched lookup (backed by the process-wide
+    FolderIndex), then download each folder into download_path. A cached ID
+    that Drive no longer knows (404) is dropped from the index and looked up
+    again. Files go through the shared AssetStore (see
+    asset_store.default_store), so assets already fetched for another task
+    are hardlinked instead of downloaded.
+    With sync=True a folder downloaded before is compared against its
+    SYNC_STATE_FILE and only new or changed files (including Google Docs
+    items edited since their last export) are transferred.
+    With make_zip=True each folder is zipped while it downloads.
+    Returns the names of folders that were not found or had files fail.
     """
-    creds = authenticate()
-    service = build("drive", "v3", credentials=creds)
+    from googleapiclient.errors import HttpError
+    from drive_client import default_drive
+
+    drive = default_drive()
+    service = drive.service()
 
     if download_path:
         base_path = download_path
     else:
         base_path = os.getenv("TASKFOLDERPASS", os.getcwd())
-    
-    local_folder_path = os.path.join(base_path, target_folder_name)
 
-    folder_id = get_folder_id(service, target_folder_name)
-    if not folder_id:
-        print("Target folder not found. Exiting.")
-        return
+    index = default_index()
+    store = default_store()
+    # Cached IDs are checked in one batch up front; gone or trashed ones are searched for again below.
+    cached = {name: index.get(name) for name in dict.fromkeys(folder_names) if index.get(name)}
+    if cached:
+        found, errors = get_files_metadata(service, cached.values(), fields="id, trashed")
+        for name, folder_id in cached.items():
+            error = errors.get(folder_id)
+            if error is not None and error.resp.status != 404:
+                continue
+            if folder_id not in found or found[folder_id].get("trashed"):
+                print(f"⚠️ Cached ID for '{name}' is stale, searching again.")
+                index.invalidate(name)
+    folder_ids = resolve_folder_ids(service, folder_names, index)
 
-    total_files = count_files(service, folder_id)
-    print(f"Total files to download: {total_files}")
+    # Every worker thread gets its own service from the provider.
+    service_factory = drive.service
 
-    with tqdm(total=total_files, desc="Overall Download Progress", unit="file") as pbar:
-        download_folder_sequential(service, folder_id, local_folder_path, pbar)
+    incomplete = []
+    for folder_name in dict.fromkeys(folder_names):
+        folder_id = folder_ids.get(folder_name)
+        if not folder_id:
+            print(f"Folder '{folder_name}' not found.")
+            incomplete.append(folder_name)
+            continue
+        print(f"🗂 Found folder: {folder_name} (ID: {folder_id})")
+        local_folder_path = os.path.join(base_path, folder_name)
+        os.makedirs(local_folder_path, exist_ok=True)
 
-    # zip_file = zip_folder(local_folder_path)
-    # print(f"Download and zip completed: {zip_file}")
+        try:
+            manifest = build_manifest(service, folder_id, local_folder_path)
+        except HttpError as e:
+            if e.resp.status != 404:
+                raise
+            print(f"⚠️ Cached ID for '{folder_name}' is stale, searching again.")
+            index.invalidate(folder_name)
+            folder_id = get_folder_id(service, folder_name, index)
+            if not folder_id:
+                incomplete.append(folder_name)
+                continue
+            manifest = build_manifest(service, folder_id, local_folder_path)
+
+        if make_zip:
+            with ZipPackager(local_folder_path) as packager:
+                failed = download_to_folder(service_factory, manifest, local_folder_path, workers=workers,
+                                            sync=sync, packager=packager, store=store)
+        else:
+            failed = download_to_folder(service_factory, manifest, local_folder_path, workers=workers, sync=sync,
+                                        store=store)
+        if failed:
+            incomplete.append(folder_name)
+    return incomplete
+
+def main_downloader(target_folder_name: str, download_path: str = None, workers: int = 1, sync: bool = False,
+                    make_zip: bool = False):
+    """
+    Authenticate, locate the target folder on Drive, list its whole tree once,
+    download all files with a single overall progress bar, and zip the folder.
+    With workers > 1 files are fetched concurrently by that many threads.
+    Skips files that are already downloaded; with sync=True, re-fetches files changed on Drive.
+    """
+    download_folders([target_folder_name], download_path=download_path, workers=workers, sync=sync,
+                     make_zip=make_zip)
 
 def main():
     parser = argparse.ArgumentParser(
@@ -178,10 +622,30 @@ def main():
         help=("Optional: Path where the folder should be downloaded. "
               "If not provided, defaults to the TASKFOLDERPASS environment variable (or current directory).")
     )
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        default=1,
+        help="Number of files to download concurrently (default: 1, sequential)."
+    )
+    parser.add_argument(
+        "-s", "--sync",
+        action="store_true",
+        help="Re-sync an already downloaded folder: fetch only files that are new or changed on Drive."
+    )
+
+    parser.add_argument(
+        "-z", "--zip",
+        action="store_true",
+        help="Zip the folder while it downloads (media is stored, the rest compressed in parallel)."
+    )
 
     args = parser.parse_args()
     folder_name = " ".join(args.folder_name)
-    main_downloader(folder_name)
+    main_downloader(folder_name, download_path=args.path, workers=args.workers, sync=args.sync,
+                    make_zip=args.zip)
+    from transport import stats as http_stats
+    print(f"📊 {http_stats.summary()}")
 
 if __name__ == "__main__":
     main()
@@ -1,21 +1,22 @@
 import os
 import requests
 import re
-from bs4 import BeautifulSoup
-from urllib.parse import urlparse, parse_qs, urlunparse
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, NamedTuple, Optional
+from description_parser import ParsedDescription, parse_description
+from download_links import extract_links
+from transport import new_session
+from urllib.parse import urlparse, parse_qs, parse_qsl, urlencode, urlunparse
 import mimetypes
 import platform
 import subprocess
 
-def description_extractor(description: str, path: str) -> str:
-    """Improved description extractor with link preservation"""
-    soup = BeautifulSoup(description, "html.parser")
-    
-    # Preserve links in text format
-    for a in soup.find_all('a'):
-        a.replace_with(f"{a.text} ({a['href']})")
-    
-    formatted_description = soup.get_text(separator="\n", strip=True)
+def description_extractor(description: Optional[str], path: str, parsed: Optional[ParsedDescription] = None) -> str:
+    """Improved description extractor with link preservation; pass `parsed` to reuse an earlier parse"""
+    formatted_description = (parsed or parse_description(description)).text
     desc_path = os.path.join(path, "description.txt")
     
     with open(desc_path, "w", encoding="utf-8") as f:
@@ -76,54 +77,189 @@ def safe_filename_from_url(url: str, content_type: str = None) -> str:
     
     return filename
 
-def download_href_links(description: str, download_dir: str) -> None:
-    """Enhanced downloader with better error handling and headers"""
-    soup = BeautifulSoup(description, "html.parser")
-    links = soup.find_all("a", href=True)
-    
-    session = requests.Session()
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'
-    })
+# Reference links are fetched concurrently, but never more than
+# HREF_PER_HOST_LIMIT at a time from one host (Dropbox/Drive throttle hard).
+HREF_WORKERS = 6
+HREF_PER_HOST_LIMIT = 2
+# Query parameters that only track the click and never change the file served.
+TRACKING_PARAMS = {"utm_source", "utm_medium", "utm_campaign", "utm_term", "utm_content", "fbclid", "gclid"}
 
-    for a in links:
-        url = a["href"]
-        if not url.startswith(('http://', 'https://')):
-            continue
+_session = None
+_session_lock = threading.Lock()
+_host_limits = {}
+
+
+class LinkResult(NamedTuple):
+    url: str
+    status: str  # "saved", "linked", "exists", "duplicate" or "failed"
+    path: Optional[str] = None
+    size: int = 0
+    seconds: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second, 0 when nothing was transferred."""
+        return self.size / self.seconds if self.size and self.seconds else 0.0
+
+
+def get_shared_session() -> requests.Session:
+    """Return the process-wide session used for reference downloads, on the app's shared connection pools."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = new_session()
+            _session.headers.update({
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'
+            })
+        return _session
+
+
+def _host_limit(host: str) -> threading.Semaphore:
+    with _session_lock:
+        if host not in _host_limits:
+            _host_limits[host] = threading.Semaphore(HREF_PER_HOST_LIMIT)
+        return _host_limits[host]
+
+
+def normalize_download_url(url: str) -> str:
+    """
+    Canonical form of a link's direct download URL, so different links to the
+    same file (Drive /file/d/ID/view vs open?id=ID, Dropbox dl=0 vs dl=1,
+    tracking parameters, fragments) compare equal.
+    """
+    parsed = urlparse(get_direct_download_url(url))
+    query = sorted((k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True) if k not in TRACKING_PARAMS)
+    return urlunparse((parsed.scheme.lower(), parsed.netloc.lower(), parsed.path, "", urlencode(query), ""))
+
+
+def _link_alias(store, alias, url, download_dir, claimed, claimed_lock, start) -> Optional[LinkResult]:
+    """Serve a link from the asset store; None if the stored object is gone and the link must be downloaded."""
+    save_path = os.path.join(download_dir, alias.filename)
+    with claimed_lock:
+        if save_path in claimed:
+            return LinkResult(url, "duplicate", save_path)
+        claimed.add(save_path)
+    if not store.link_into(alias.key, save_path):
+        with claimed_lock:
+            claimed.discard(save_path)
+        return None
+    print(f"🔗 Linked from asset store: {alias.filename}")
+    return LinkResult(url, "linked", save_path, seconds=time.perf_counter() - start)
 
-        try:
-            direct_url = get_direct_download_url(url)
-            
-            with session.get(direct_url, stream=True, timeout=30) as response:
-                response.raise_for_status()
-                
-                # Get content type and filename
-                content_type = response.headers.get('Content-Type', '')
-                filename = safe_filename_from_url(url, content_type)
-                
-                # Handle Content-Disposition filename
-                if 'Content-Disposition' in response.headers:
-                    cd_filename = re.findall('filename="?([^"]+)"?', response.headers['Content-Disposition'])
-                    if cd_filename:
-                        filename = cd_filename[0]
-
-                save_path = os.path.join(download_dir, filename)
-                
-                if os.path.exists(save_path):
-                    print(f"✅ File exists: {filename}")
-                    continue
-
-                print(f"⬇️ Downloading: {filename}")
-                with open(save_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                
-                print(f"✅ Saved: {save_path}")
 
+def _save_response(response, url, direct_url, download_dir, claimed, claimed_lock, store, start) -> LinkResult:
+    response.raise_for_status()
+
+    # Get content type and filename
+    content_type = response.headers.get('Content-Type', '')
+    filename = safe_filename_from_url(url, content_type)
+
+    # Handle Content-Disposition filename
+    if 'Content-Disposition' in response.headers:
+        cd_filename = re.findall('filename="?([^"]+)"?', response.headers['Content-Disposition'])
+        if cd_filename:
+            filename = cd_filename[0]
+
+    save_path = os.path.join(download_dir, filename)
+    # Two different links can still land on the same file name; only the first one writes it.
+    with claimed_lock:
+        if save_path in claimed:
+            return LinkResult(url, "duplicate", save_path)
+        claimed.add(save_path)
+
+    if os.path.exists(save_path):
+        print(f"✅ File exists: {filename}")
+        return LinkResult(url, "exists", save_path)
+
+    print(f"⬇️ Downloading: {filename}")
+    size = 0
+    digest = hashlib.sha256()
+    part_path = f"{save_path}.part"
+    with open(part_path, 'wb') as f:
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            f.write(chunk)
+            digest.update(chunk)
+            size += len(chunk)
+    os.replace(part_path, save_path)
+    if store:
+        key = f"sha256-{digest.hexdigest()}"
+        store.ingest(save_path, key)
+        store.remember_url(direct_url, key, filename, response.headers.get("ETag"))
+
+    result = LinkResult(url, "saved", save_path, size, time.perf_counter() - start)
+    print(f"✅ Saved: {save_path} ({size / 1024**2:.1f} MB in {result.seconds:.1f}s, "
+          f"{result.throughput / 1024**2:.2f} MB/s)")
+    return result
+
+
+def _download_link(session, url, direct_url, download_dir, claimed, claimed_lock, store=None) -> LinkResult:
+    start = time.perf_counter()
+    alias = store.lookup_url(direct_url) if store else None
+    if alias and alias.fresh:
+        result = _link_alias(store, alias, url, download_dir, claimed, claimed_lock, start)
+        if result:
+            return result
+        alias = None
+    # A stale alias with an ETag is revalidated; without one the link is simply downloaded again.
+    headers = {"If-None-Match": alias.etag} if alias and alias.etag else None
+    args = (url, direct_url, download_dir, claimed, claimed_lock, store, start)
+
+    with _host_limit(urlparse(direct_url).netloc):
+        with session.get(direct_url, stream=True, timeout=30, headers=headers) as response:
+            if not (headers and response.status_code == 304):
+                return _save_response(response, *args)
+            store.remember_url(direct_url, alias.key, alias.filename, alias.etag)
+            result = _link_alias(store, alias, url, download_dir, claimed, claimed_lock, start)
+            if result:
+                return result
+        # Unchanged, but the stored copy went missing since lookup_url: fetch it again.
+        with session.get(direct_url, stream=True, timeout=30) as response:
+            return _save_response(response, *args)
+
+
+def download_href_links(description: Optional[str], download_dir: str, workers: int = HREF_WORKERS,
+                        store=None, hrefs: Optional[List[str]] = None) -> List[LinkResult]:
+    """
+    Download every http(s) link in the description concurrently over a shared
+    pooled session. Links that normalise to the same direct URL are fetched
+    once. With an AssetStore, links fetched before (by any task) are linked
+    from the store without a request for ASSET_URL_TTL, then revalidated
+    with their ETag; new files are added to it by content hash. Returns one LinkResult per link with its timing and throughput.
+    `hrefs` (e.g. ParsedDescription.hrefs) saves scanning the description again.
+    """
+    if hrefs is None:
+        hrefs = extract_links(description or "").hrefs
+    urls = [url for url in hrefs if url.startswith(('http://', 'https://'))]
+
+    unique = {}
+    results = []
+    for url in urls:
+        key = normalize_download_url(url)
+        if key in unique:
+            results.append(LinkResult(url, "duplicate"))
+        else:
+            unique[key] = url
+    if not unique:
+        return results
+
+    session = get_shared_session()
+    claimed = set()
+    claimed_lock = threading.Lock()
+
+    def fetch(item):
+        direct_url, url = item  # the normalised URL is itself a valid direct download URL
+        start = time.perf_counter()
+        try:
+            return _download_link(session, url, direct_url, download_dir, claimed, claimed_lock, store)
         except requests.exceptions.RequestException as e:
             print(f"❌ Download failed: {url} - {str(e)}")
         except Exception as e:
             print(f"❌ Unexpected error with {url}: {str(e)}")
+        return LinkResult(url, "failed", seconds=time.perf_counter() - start)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results.extend(pool.map(fetch, unique.items()))
+    return results
 
 
 def system_chime():
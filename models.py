@@ -1,4 +1,6 @@
 # models.py
+import sys
+from collections import namedtuple
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
@@ -37,3 +39,46 @@ class Task(BaseModel):
     products: List[Product]
     motioners: List[UserRef]
     illustrators: List[UserRef]
+
+
+# Low-cardinality string fields shared by thousands of tasks; interned so they share one object.
+_INTERNED_FIELDS = (
+    "status", "accountId", "creatorId", "illustratorId", "motionerId",
+    "illustrationReviewerId", "motionReviewerId",
+)
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class CompactTask(namedtuple("CompactTaskFields", list(Task.model_fields))):
+    """
+    Read-only, tuple-backed form of Task for long-running pollers.
+    Same field names as Task, but without a per-instance __dict__, with
+    status/account/user-id strings interned, and with products, motioners and
+    illustrators stored as tuples of plain ids instead of model lists.
+    Converts losslessly to and from Task.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_task(cls, task: Task) -> "CompactTask":
+        values = dict(task)
+        for name in _INTERNED_FIELDS:
+            values[name] = _intern(values[name])
+        values["adPlatforms"] = tuple(map(_intern, task.adPlatforms))
+        values["localizations"] = tuple(map(_intern, task.localizations))
+        values["products"] = tuple(product.productId for product in task.products)
+        values["motioners"] = tuple(_intern(user.userId) for user in task.motioners)
+        values["illustrators"] = tuple(_intern(user.userId) for user in task.illustrators)
+        return cls(**values)
+
+    def to_task(self) -> Task:
+        values = self._asdict()
+        values["adPlatforms"] = list(self.adPlatforms)
+        values["localizations"] = list(self.localizations)
+        values["products"] = [Product(productId=product_id) for product_id in self.products]
+        values["motioners"] = [UserRef(userId=user_id) for user_id in self.motioners]
+        values["illustrators"] = [UserRef(userId=user_id) for user_id in self.illustrators]
+        return Task(**values)
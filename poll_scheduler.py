@@ -0,0 +1,123 @@
+# poll_scheduler.py
+import os
+import time
+import random
+from typing import Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+POLL_INTERVAL = float(os.getenv("POLL_INTERVAL", 60))
+POLL_FAST_INTERVAL = float(os.getenv("POLL_FAST_INTERVAL", 50))
+POLL_MAX_INTERVAL = float(os.getenv("POLL_MAX_INTERVAL", 90))
+
+
+class PollStats:
+    """Counters for the board poll: outcomes, latency and bytes received."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.polls = 0
+        self.changed = 0
+        self.not_modified = 0
+        self.errors = 0
+        self.bytes = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.last_latency = 0.0
+
+    def record(self, status: Optional[int], changed: bool, nbytes: int, latency: float) -> None:
+        self.polls += 1
+        if status == 304:
+            self.not_modified += 1
+        elif status is None or status >= 400:
+            self.errors += 1
+        elif changed:
+            self.changed += 1
+        self.bytes += nbytes
+        self.last_latency = latency
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+
+    @property
+    def latency_avg(self) -> float:
+        return self.latency_total / self.polls if self.polls else 0.0
+
+    @property
+    def bytes_per_hour(self) -> float:
+        hours = (time.monotonic() - self.started) / 3600
+        return self.bytes / hours if hours else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.polls} polls ({self.changed} changed, {self.not_modified} not modified, {self.errors} errors), "
+                f"latency {self.last_latency * 1000:.0f} ms (avg {self.latency_avg * 1000:.0f}, "
+                f"max {self.latency_max * 1000:.0f}), {self.bytes_per_hour / 1e6:.1f} MB/h")
+
+
+class PollScheduler:
+    """
+    Decide how long to wait before the next board poll.
+
+    Right after a change the board is polled every `fast` seconds for
+    `fast_polls` polls, since edits tend to come in bursts. After
+    `backoff_after` quiet polls (304s or unchanged boards) or any error the
+    interval grows by `factor` per poll up to `max_interval`, with +/-`jitter`
+    so several pollers don't line up. A server Retry-After is always honoured.
+
+    The defaults are a trade-off, not a free win (see
+    benchmarks/bench_poll_schedule.py). Polling sooner after a change picks
+    up more of a burst's edits one by one, so a few percent more full boards
+    are downloaded. In exchange there are ~12% fewer polls and edits are seen
+    sooner on average. The first edit after a quiet hour can wait up to
+    `max_interval`.
+    """
+
+    def __init__(self, interval: float = POLL_INTERVAL, fast: float = POLL_FAST_INTERVAL,
+                 max_interval: float = POLL_MAX_INTERVAL, fast_polls: int = 3, backoff_after: int = 60,
+                 factor: float = 1.5, jitter: float = 0.2):
+        self.interval = interval
+        self.fast = fast
+        self.max_interval = max_interval
+        self.fast_polls = fast_polls
+        self.backoff_after = backoff_after
+        self.factor = factor
+        self.jitter = jitter
+        self.stats = PollStats()
+        self._fast_left = 0
+        self._quiet = 0
+        self._errors = 0
+        self._retry_after: Optional[float] = None
+
+    def record(self, status: Optional[int], changed: bool = False, nbytes: int = 0,
+               latency: float = 0.0, retry_after: Optional[float] = None) -> None:
+        """Feed in the outcome of a poll; status is None when no response arrived."""
+        self.stats.record(status, changed, nbytes, latency)
+        self._retry_after = retry_after
+        if status is None or status >= 400:
+            self._errors += 1
+            return
+        self._errors = 0
+        if changed:
+            self._fast_left = self.fast_polls
+            self._quiet = 0
+        else:
+            self._fast_left = max(self._fast_left - 1, 0)
+            self._quiet += 1
+
+    def next_delay(self) -> float:
+        if self._errors:
+            delay = self._backoff(self._errors)
+        elif self._fast_left:
+            delay = self.fast
+        elif self._quiet > self.backoff_after:
+            delay = self._backoff(self._quiet - self.backoff_after)
+        else:
+            delay = self.interval
+        if self._retry_after is not None:
+            delay = max(delay, self._retry_after)
+        return delay
+
+    def _backoff(self, steps: int) -> float:
+        """interval * factor**steps, +/-jitter, capped at max_interval (where jitter can only shorten it)."""
+        delay = self.interval * self.factor ** steps * random.uniform(1 - self.jitter, 1 + self.jitter)
+        return min(delay, self.max_interval * random.uniform(1 - self.jitter, 1))
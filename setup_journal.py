@@ -0,0 +1,117 @@
+# setup_journal.py
+import os
+import time
+import sqlite3
+import threading
+from typing import List, Optional
+from dotenv import load_dotenv
+from models import Task
+
+load_dotenv()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    taskId TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    task TEXT NOT NULL,
+    createdAt REAL NOT NULL,
+    updatedAt REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stages (
+    taskId TEXT NOT NULL REFERENCES jobs (taskId) ON DELETE CASCADE,
+    stage TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    updatedAt REAL,
+    PRIMARY KEY (taskId, stage)
+);
+CREATE INDEX IF NOT EXISTS stages_unfinished ON stages (status, taskId);
+CREATE INDEX IF NOT EXISTS jobs_priority ON jobs (priority DESC, createdAt);
+"""
+
+# Stage statuses; "running" left behind by a crash counts as unfinished.
+PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+# A stage that has been started this many times without finishing is given up on.
+STAGE_ATTEMPTS = int(os.getenv("SETUP_STAGE_ATTEMPTS", 3))
+
+
+class SetupJournal:
+    """
+    Durable record of task setups and their stages (see task_manager.plan_stages),
+    so a setup interrupted by a crash resumes with the stages that did not finish
+    instead of being skipped because its folder already exists. Safe to share
+    between the pipeline's worker threads.
+    """
+
+    def __init__(self, db_path: str = "setup_journal.db"):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    def has_job(self, task_id: str) -> bool:
+        with self._lock:
+            return self.conn.execute("SELECT 1 FROM jobs WHERE taskId = ?", (task_id,)).fetchone() is not None
+
+    def add_job(self, task: Task, stages: List[str]) -> None:
+        """Record a task and its stages. Stages already journaled keep their status; new ones are appended."""
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO jobs (taskId, name, priority, task, createdAt, updatedAt) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (taskId) DO UPDATE SET priority = excluded.priority, task = excluded.task, "
+                "updatedAt = excluded.updatedAt",
+                (task.taskId, task.name, task.priority, task.model_dump_json(), now, now),
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO stages (taskId, stage, position, updatedAt) VALUES (?, ?, ?, ?)",
+                ((task.taskId, stage, position, now) for position, stage in enumerate(stages)),
+            )
+
+    def unfinished_stages(self, task_id: str) -> List[str]:
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT stage FROM stages WHERE taskId = ? AND status != ? AND attempts < ? ORDER BY position",
+                (task_id, DONE, STAGE_ATTEMPTS),
+            ).fetchall()
+        return [stage for stage, in rows]
+
+    def mark(self, task_id: str, stage: str, status: str, error: Optional[str] = None) -> None:
+        with self._lock, self.conn:
+            self.conn.execute(
+                "UPDATE stages SET status = ?, error = ?, updatedAt = ?, "
+                "attempts = attempts + ? WHERE taskId = ? AND stage = ?",
+                (status, error, time.time(), int(status == RUNNING), task_id, stage),
+            )
+
+    def unfinished_jobs(self) -> List[Task]:
+        """Tasks with stages still to run, highest priority first, e.g. to resubmit after a restart."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT task FROM jobs WHERE taskId IN "
+                "(SELECT taskId FROM stages WHERE status != ? AND attempts < ?) "
+                "ORDER BY priority DESC, createdAt",
+                (DONE, STAGE_ATTEMPTS),
+            ).fetchall()
+        return [Task.model_validate_json(task) for task, in rows]
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+_journal: Optional[SetupJournal] = None
+_journal_lock = threading.Lock()
+
+
+def default_journal() -> SetupJournal:
+    """The process-wide journal at SETUP_JOURNAL_DB (default setup_journal.db)."""
+    global _journal
+    with _journal_lock:
+        if _journal is None:
+            _journal = SetupJournal(os.getenv("SETUP_JOURNAL_DB", "setup_journal.db"))
+        return _journal
@@ -0,0 +1,224 @@
+# task_history.py
+import time
+import zlib
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from pydantic_core import from_json, to_json
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    taskId TEXT PRIMARY KEY,
+    name TEXT,
+    status TEXT,
+    motionerId TEXT,
+    accountId TEXT,
+    priority INTEGER,
+    statusChangeTime TEXT,
+    fingerprint TEXT NOT NULL,
+    data BLOB NOT NULL,
+    description TEXT,
+    updatedAt REAL NOT NULL,
+    removedAt REAL
+);
+CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status);
+CREATE INDEX IF NOT EXISTS tasks_motioner ON tasks (motionerId);
+CREATE INDEX IF NOT EXISTS tasks_status_change ON tasks (statusChangeTime);
+
+CREATE TABLE IF NOT EXISTS transitions (
+    id INTEGER PRIMARY KEY,
+    taskId TEXT NOT NULL,
+    fromStatus TEXT,
+    toStatus TEXT NOT NULL,
+    motionerId TEXT,
+    changedAt TEXT,
+    recordedAt REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transitions_task ON transitions (taskId, changedAt);
+CREATE INDEX IF NOT EXISTS transitions_motioner ON transitions (motionerId, changedAt);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+-- Transitions are written by the database itself, so they can't drift from the tasks table.
+CREATE TRIGGER IF NOT EXISTS tasks_created AFTER INSERT ON tasks BEGIN
+    INSERT INTO transitions (taskId, fromStatus, toStatus, motionerId, changedAt, recordedAt)
+    VALUES (new.taskId, NULL, new.status, new.motionerId, new.statusChangeTime, new.updatedAt);
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_status_changed AFTER UPDATE OF status ON tasks
+WHEN old.status IS NOT new.status BEGIN
+    INSERT INTO transitions (taskId, fromStatus, toStatus, motionerId, changedAt, recordedAt)
+    VALUES (new.taskId, old.status, new.status, new.motionerId, new.statusChangeTime, new.updatedAt);
+END;
+"""
+
+# upsert() only sends rows whose fingerprint changed; the WHERE clause is a backstop for other writers.
+UPSERT = """
+INSERT INTO tasks (taskId, name, status, motionerId, accountId, priority, statusChangeTime,
+                   fingerprint, data, description, updatedAt, removedAt)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, NULL)
+ON CONFLICT (taskId) DO UPDATE SET
+    name = excluded.name, status = excluded.status, motionerId = excluded.motionerId,
+    accountId = excluded.accountId, priority = excluded.priority,
+    statusChangeTime = excluded.statusChangeTime, fingerprint = excluded.fingerprint,
+    data = excluded.data, description = excluded.description, updatedAt = excluded.updatedAt, removedAt = NULL
+WHERE tasks.fingerprint IS NOT excluded.fingerprint OR tasks.removedAt IS NOT NULL
+"""
+
+# Seconds each transition lasted: until the task's next transition, or until now for the current status.
+TIME_IN_STATUS = """
+SELECT motionerId, SUM((julianday(COALESCE(endedAt, 'now')) - julianday(changedAt)) * 86400)
+FROM (
+    SELECT motionerId, toStatus, changedAt,
+           LEAD(changedAt) OVER (PARTITION BY taskId ORDER BY changedAt, id) AS endedAt
+    FROM transitions
+)
+WHERE toStatus = ? AND changedAt >= ? AND changedAt < ?
+GROUP BY motionerId
+"""
+
+
+# The WAL is cut back to this size after checkpoints, so one big write doesn't leave it at full size.
+WAL_SIZE_LIMIT = 16 * 1024 * 1024
+
+
+def _serialize(item: dict) -> Tuple[str, bytes]:
+    """
+    (fingerprint, data) for a raw item. The description is most of a task,
+    so it is checksummed and stored in its own column as is; data is the JSON
+    of the rest, with the description nulled in place to keep the key order.
+    The fingerprint is stable across runs (unlike hash()), so it can be
+    compared with the stored one.
+    """
+    description = (item.get("description") or "").encode("utf-8")
+    data = to_json({**item, "description": None})
+    return f"{item.get('statusChangeTime')}:{zlib.crc32(description):08x}:{zlib.crc32(data):08x}", data
+
+
+def _load(data: bytes, description: Optional[str]) -> dict:
+    # Rows written before the description column hold the whole item, some of them zlib-compressed.
+    item = from_json(data if data[:1] == b"{" else zlib.decompress(data))
+    if description is not None:
+        item["description"] = description
+    return item
+
+
+def _motioner_id(item: dict) -> Optional[str]:
+    """motionerId, or the first motioner when the task has several."""
+    if item.get("motionerId"):
+        return item["motionerId"]
+    motioners = item.get("motioners") or []
+    return motioners[0].get("userId") if motioners else None
+
+
+class TaskHistory:
+    """
+    Persistent task board in SQLite (WAL mode). Keeps the latest version of
+    every task plus a log of status transitions, so questions like "time in
+    MOTION_IN_PROCESS per motioner last month" are one indexed query.
+    """
+
+    def __init__(self, db_path: str = "task_history.db"):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(f"PRAGMA journal_size_limit={WAL_SIZE_LIMIT}")
+        self.conn.executescript(SCHEMA)
+        if "description" not in {row[1] for row in self.conn.execute("PRAGMA table_info(tasks)")}:
+            self.conn.execute("ALTER TABLE tasks ADD COLUMN description TEXT")
+        # Fingerprints of the tasks on the board, so upsert() skips unchanged items without touching SQLite.
+        self._fingerprints: Dict[str, str] = dict(
+            self.conn.execute("SELECT taskId, fingerprint FROM tasks WHERE removedAt IS NULL")
+        )
+
+    def close(self) -> None:
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.conn.close()
+
+    def upsert(self, items: Iterable[dict]) -> int:
+        """
+        Store raw task items from get_tasks; returns how many rows actually
+        changed. Items whose fingerprint matches the stored one are skipped
+        before anything is serialized or sent to SQLite.
+        """
+        now = time.time()
+        rows = []
+        for item in items:
+            task_id = item["taskId"]
+            fingerprint, data = _serialize(item)
+            if self._fingerprints.get(task_id) == fingerprint:
+                continue
+            rows.append((
+                task_id, item.get("name"), item.get("status"), _motioner_id(item),
+                item.get("accountId"), item.get("priority"), item.get("statusChangeTime"),
+                fingerprint, data, item.get("description"), now,
+            ))
+        if not rows:
+            return 0
+        with self.conn:
+            changed = self.conn.executemany(UPSERT, rows).rowcount
+        self._fingerprints.update((row[0], row[7]) for row in rows)
+        return changed
+
+    def mark_removed(self, task_ids: Iterable[str]) -> None:
+        """Flag tasks that disappeared from the board; their history is kept until pruned."""
+        now = time.time()
+        task_ids = list(task_ids)
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE tasks SET removedAt = ? WHERE taskId = ? AND removedAt IS NULL",
+                ((now, task_id) for task_id in task_ids),
+            )
+        for task_id in task_ids:
+            self._fingerprints.pop(task_id, None)
+
+    def board(self) -> List[dict]:
+        """The raw items of every task currently on the board, as last stored."""
+        rows = self.conn.execute("SELECT data, description FROM tasks WHERE removedAt IS NULL ORDER BY rowid")
+        return [_load(data, description) for data, description in rows]
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: Optional[str]) -> None:
+        """Small bits of poller state kept next to the board, e.g. the ETag it was fetched with."""
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def board_ids(self) -> Set[str]:
+        return set(self._fingerprints)
+
+    def prune(self, max_age_days: float) -> int:
+        """Drop transitions recorded, and removed tasks flagged, more than max_age_days ago."""
+        cutoff = time.time() - max_age_days * 86400
+        with self.conn:
+            deleted = self.conn.execute("DELETE FROM transitions WHERE recordedAt < ?", (cutoff,)).rowcount
+            deleted += self.conn.execute("DELETE FROM tasks WHERE removedAt < ?", (cutoff,)).rowcount
+        return deleted
+
+    # Query helpers ----------------------------------------------------------
+
+    def tasks_in_status(self, status: str, motioner: Optional[str] = None) -> List[dict]:
+        query = "SELECT data, description FROM tasks WHERE status = ? AND removedAt IS NULL"
+        params = [status]
+        if motioner:
+            query += " AND motionerId = ?"
+            params.append(motioner)
+        return [_load(data, description) for data, description in self.conn.execute(query, params)]
+
+    def transitions(self, task_id: str) -> List[tuple]:
+        """(fromStatus, toStatus, changedAt) for one task, oldest first."""
+        return self.conn.execute(
+            "SELECT fromStatus, toStatus, changedAt FROM transitions WHERE taskId = ? ORDER BY changedAt, id",
+            (task_id,),
+        ).fetchall()
+
+    def time_in_status(self, status: str, since: str = "", until: str = "9999") -> Dict[str, float]:
+        """
+        Seconds spent in `status` per motioner, for stints that started in
+        [since, until). Bounds are ISO timestamps like "2025-02-01".
+        """
+        return dict(self.conn.execute(TIME_IN_STATUS, (status, since, until)).fetchall())
@@ -1,61 +1,138 @@
 import os
 import shutil
+from typing import List
 from models import Task
+from asset_store import default_store
 from dotenv import load_dotenv
-from download_links import extract_download_links
-from gd import main_downloader as google_downloader
+from description_parser import ParsedDescription, parse_description
 from helpers import description_extractor, download_href_links, system_chime
+from setup_journal import DONE, FAILED, RUNNING, SetupJournal, default_journal
 
 load_dotenv()
 
-path = os.getenv("TASKFOLDERPASS")
-dropboxFolder = os.getenv("DROPBOX")
-aeFile = os.getenv("PROJECT")
-aeFileName, ext = os.path.splitext(aeFile)
-
-
-def setup_new_task(task: Task) -> None:
-    # print(f"Discription: {task.description}")
-    task_folder_path = os.path.join(path, task.name)
-    dropbox_patch = os.path.join(dropboxFolder, task.name)
-    # print(f"folder path is {task_folder_path}")
-
-    if not os.path.exists(task_folder_path):
-        os.makedirs(task_folder_path)
-        if not os.path.exists(dropbox_patch):
-            os.makedirs(dropbox_patch)
-
-
-        shutil.copy2(os.path.join(path, aeFile), os.path.join(task_folder_path, f"{task.name}{ext}"))
-
-
-        formatted_description = description_extractor(description=task.description, path=task_folder_path)
-        download_href_links(task.description, task_folder_path)
-        #parse tasks descrition
-        download_links = extract_download_links(task.description)
-        # print(f"download_links: {download_links}")
-        #download folders
-        if download_links:
-            print(f"Found {len(download_links)} download links in task description.")
-            for link in download_links:
-                google_downloader(link, download_path=task_folder_path)
+DRIVE_STAGE = "drive:"
+
+
+def _env(name: str) -> str:
+    """A required setting from the environment / .env, read when a setup needs it rather than at import."""
+    value = os.getenv(name)
+    if not value:
+        raise RuntimeError(f"{name} is not set")
+    return value
+
+
+def plan_stages(task: Task, parsed: ParsedDescription = None) -> List[str]:
+    """The setup stages for a task, in the order they run: one per Drive folder in the description."""
+    parsed = parsed or parse_description(task.description or "")
+    stages = ["ae_copy", "description", "hrefs"]
+    stages += [f"{DRIVE_STAGE}{name}" for name in dict.fromkeys(parsed.names)]
+    return stages
+
+
+def journal_setup(task: Task, journal: SetupJournal = None, parsed: ParsedDescription = None) -> bool:
+    """
+    Record a task and its planned stages in the setup journal, so it is
+    resumed after a crash even if no worker has picked it up yet. Returns
+    False for a folder set up before the journal existed, which is left alone.
+    """
+    journal = journal or default_journal()
+    if not journal.has_job(task.taskId) and os.path.exists(os.path.join(_env("TASKFOLDERPASS"), task.name)):
+        print(f"Task folder {task.name} already exists, skipping setup.")
+        return False
+    # Planning again on every run picks up Drive folders added to the description since.
+    journal.add_job(task, plan_stages(task, parsed))
+    return True
+
+
+def _copy_ae_project(task: Task, task_folder_path: str) -> None:
+    aeFile = _env("PROJECT")
+    target = os.path.join(task_folder_path, f"{task.name}{os.path.splitext(aeFile)[1]}")
+    if os.path.exists(target):
+        # Never overwrite a project that may already have work in it.
+        return
+    shutil.copy2(os.path.join(_env("TASKFOLDERPASS"), aeFile), f"{target}.part")
+    os.replace(f"{target}.part", target)
+
+
+def _run_stage(task: Task, stage: str, task_folder_path: str, parsed: ParsedDescription) -> None:
+    if stage == "ae_copy":
+        _copy_ae_project(task, task_folder_path)
+    elif stage == "description":
+        description_extractor(description=task.description, path=task_folder_path, parsed=parsed)
+    elif stage == "hrefs":
+        results = download_href_links(task.description, task_folder_path, store=default_store(),
+                                      hrefs=parsed.hrefs)
+        failed = [result.url for result in results if result.status == "failed"]
+        if failed:
+            raise RuntimeError(f"{len(failed)} link(s) failed: {', '.join(failed)}")
+    else:
+        raise ValueError(f"Unknown setup stage {stage!r}")
+
+
+def setup_new_task(task: Task, workers: int = 1, journal: SetupJournal = None) -> None:
+    """
+    Set up a task folder stage by stage (see plan_stages), recording each
+    stage in the setup journal. A task whose setup was interrupted resumes
+    with its unfinished stages; a folder set up before the journal existed
+    is left alone.
+    """
+    journal = journal or default_journal()
+    task_folder_path = os.path.join(_env("TASKFOLDERPASS"), task.name)
+    dropbox_patch = os.path.join(_env("DROPBOX"), task.name)
+
+    # The description is parsed once; every stage reads its text, hrefs or folder names from this.
+    parsed = parse_description(task.description)
+    if not journal_setup(task, journal, parsed):
+        return
+
+    stages = journal.unfinished_stages(task.taskId)
+    if not stages:
+        print("Task already set up, skipping.")
+        return
+
+    os.makedirs(task_folder_path, exist_ok=True)
+    os.makedirs(dropbox_patch, exist_ok=True)
+
+    drive_stages = [stage for stage in stages if stage.startswith(DRIVE_STAGE)]
+    failed = 0
+    for stage in stages:
+        if stage in drive_stages:
+            continue
+        journal.mark(task.taskId, stage, RUNNING)
+        try:
+            _run_stage(task, stage, task_folder_path, parsed)
+        except Exception as e:
+            print(f"❌ Stage {stage} failed: {e}")
+            journal.mark(task.taskId, stage, FAILED, str(e))
+            failed += 1
         else:
-            print("No download links found in task description.")
-        
-
-        
-
-        #fromat task description and put it into txt file
-
-        #if there a links in discription, download files into folder
-
-        #copy .aep project and rename it
-
-        print("🎉 Done ")
-        system_chime()
-        
-
+            journal.mark(task.taskId, stage, DONE)
+
+    # All Drive folders go through one download_folders call, so they share one auth and one batched lookup.
+    if drive_stages:
+        print(f"Found {len(drive_stages)} download links in task description.")
+        for stage in drive_stages:
+            journal.mark(task.taskId, stage, RUNNING)
+        folder_names = [stage[len(DRIVE_STAGE):] for stage in drive_stages]
+        # The Drive client stack is only loaded by setups that have Drive folders.
+        from gd import download_folders
+        try:
+            incomplete = set(download_folders(folder_names, download_path=task_folder_path, workers=workers))
+            error = "incomplete download"
+        except Exception as e:
+            print(f"❌ Drive download failed: {e}")
+            incomplete, error = set(folder_names), str(e)
+        for name, stage in zip(folder_names, drive_stages):
+            if name in incomplete:
+                journal.mark(task.taskId, stage, FAILED, error)
+                failed += 1
+            else:
+                journal.mark(task.taskId, stage, DONE)
+    elif not parsed.names:
+        print("No download links found in task description.")
+
+    if failed:
+        print(f"⚠️ {failed} setup stage(s) failed; they will be retried on the next run.")
     else:
-        print("Task folder already exists, skipping setup.")
-
-    
\ No newline at end of file
+        print("🎉 Done ")
+    system_chime()
@@ -0,0 +1,140 @@
+# task_pipeline.py
+import queue
+import itertools
+import threading
+from typing import Callable, List, Optional, Set
+from models import Task
+
+
+class TaskPipeline:
+    """
+    Run task setups on a pool of worker threads so the poller never waits on
+    downloads. submit() queues a task (highest priority first) unless the same
+    taskId is already queued or running; shutdown() stops the workers.
+    Each task is journaled by prepare before it is queued, so queued work
+    survives a crash; a task prepare returns False for is not queued.
+    setup and prepare default to task_manager.setup_new_task and
+    journal_setup, imported with the first task so a poller with nothing to
+    set up never loads the download stack.
+    """
+
+    def __init__(self, workers: int = 2, download_workers: int = 1,
+                 setup: Optional[Callable[..., None]] = None,
+                 prepare: Optional[Callable[[Task], bool]] = None):
+        self.download_workers = download_workers
+        self._setup = setup
+        self._prepare = prepare
+        self._queue = queue.PriorityQueue()
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+        self._in_flight: Set[str] = set()
+        self._running = 0
+        self._dropped: List[Task] = []
+        self._stopping = threading.Event()
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"task-setup-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, task: Task) -> bool:
+        """Journal and queue a task for setup. Returns False if it is already queued or running, or not queued."""
+        if self._stopping.is_set():
+            return False
+        with self._lock:
+            if task.taskId in self._in_flight:
+                return False
+            self._in_flight.add(task.taskId)
+        try:
+            if self._prepare is None:
+                from task_manager import journal_setup
+                self._prepare = journal_setup
+            queued = self._prepare(task)
+        except Exception as e:
+            print(f"❌ Could not journal {task.name}: {e}")
+            queued = False
+        if not queued:
+            with self._lock:
+                self._in_flight.discard(task.taskId)
+            return False
+        self._queue.put((-task.priority, next(self._order), task))
+        return True
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._in_flight)
+
+    def _worker(self) -> None:
+        while True:
+            _, _, task = self._queue.get()
+            try:
+                if task is None:
+                    return
+                if self._stopping.is_set():
+                    with self._lock:
+                        self._dropped.append(task)
+                    return
+                with self._lock:
+                    self._running += 1
+                print(f"💥 {task.name}")
+                try:
+                    if self._setup is None:
+                        from task_manager import setup_new_task
+                        self._setup = setup_new_task
+                    self._setup(task=task, workers=self.download_workers)
+                finally:
+                    with self._lock:
+                        self._running -= 1
+            except Exception as e:
+                print(f"❌ Setup failed for {task.name}: {e}")
+            finally:
+                if task is not None:
+                    with self._lock:
+                        self._in_flight.discard(task.taskId)
+                self._queue.task_done()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop taking work. Queued tasks are not started: their ids are logged
+        and they stay in the setup journal for the next run. Running setups
+        are left to finish (wait=True joins them); interrupting the wait
+        abandons them.
+        """
+        self._stopping.set()
+        while True:
+            try:
+                _, _, task = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if task is not None:
+                with self._lock:
+                    self._dropped.append(task)
+            self._queue.task_done()
+        for _ in self._threads:
+            # Sentinels sort after every real job (priority +inf).
+            self._queue.put((float("inf"), next(self._order), None))
+        try:
+            if not wait:
+                return
+            with self._lock:
+                running = self._running
+            if running:
+                print(f"⏳ Waiting for {running} running task setup(s) to finish, Ctrl-C again to abort...")
+            try:
+                for thread in self._threads:
+                    thread.join()
+            except KeyboardInterrupt:
+                print("⚠️ Abandoned running task setups.")
+        finally:
+            self._report_dropped()
+
+    def _report_dropped(self) -> None:
+        with self._lock:
+            dropped, self._dropped = self._dropped, []
+            for task in dropped:
+                self._in_flight.discard(task.taskId)
+        if dropped:
+            print(f"⏸️ {len(dropped)} queued task setup(s) not started, left for the next run: "
+                  f"{', '.join(task.taskId for task in dropped)}")
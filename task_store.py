@@ -1,24 +1,306 @@
+import os
 import json
-from typing import List
-from models import Task
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
+from pydantic import TypeAdapter
+from pydantic_core import from_json
+from models import CompactTask, Task
+from task_history import TaskHistory
+
+# Query values: a single key or any collection of keys (matched as "in").
+Match = Union[str, Iterable[str], None]
+# Default for query criteria that aren't given. None is a value like any
+# other (no user id yet) and matches nothing, rather than everything.
+_ANY: Any = object()
+
+
+# Validating a whole list in pydantic-core skips the intermediate dict tree
+# and the per-task keyword expansion of Task(**task_dict).
+TASK_LIST = TypeAdapter(List[Task])
+
+
+def _user_ids(refs) -> Iterable[str]:
+    """User ids of a motioners/illustrators list, for Task (UserRef models) and CompactTask (plain ids)."""
+    return (ref if isinstance(ref, str) else ref.userId for ref in refs)
+
+
+def _freeze(value):
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple((key, _freeze(item)) for key, item in value.items())
+    return value
+
+
+def _fingerprint(item: dict) -> Tuple[Any, int]:
+    """Cheap change detector for a raw task item: statusChangeTime plus a hash of all its values."""
+    return item.get("statusChangeTime"), hash(tuple(
+        _freeze(value) if isinstance(value, (list, dict)) else value for value in item.values()
+    ))
+
+
+class TaskEvent(NamedTuple):
+    """A change between two polls. previous is None for "created", task is the removed task for "removed"."""
+    kind: str  # "created", "status_changed", "reassigned", "description_edited", "updated" or "removed"
+    task: Union[Task, CompactTask]
+    previous: Optional[Union[Task, CompactTask]] = None
+
+
+def _assignees(task) -> tuple:
+    return (task.motionerId, task.illustratorId, tuple(_user_ids(task.motioners)), tuple(_user_ids(task.illustrators)))
+
+
+def _diff(previous, task) -> List[TaskEvent]:
+    events = []
+    if previous.status != task.status:
+        events.append(TaskEvent("status_changed", task, previous))
+    if _assignees(previous) != _assignees(task):
+        events.append(TaskEvent("reassigned", task, previous))
+    if previous.description != task.description:
+        events.append(TaskEvent("description_edited", task, previous))
+    if not events and previous != task:
+        events.append(TaskEvent("updated", task, previous))
+    return events
+
 
 class TaskStore:
-    def __init__(self, filename: str):
+    def __init__(self, filename: Optional[str] = None, compact: bool = False,
+                 history: Optional[TaskHistory] = None):
+        """
+        filename: optional JSON snapshot file.
+        compact: keep tasks as CompactTask instead of Task to save memory in
+        long-running pollers (CompactTask.to_task() gives the full model back).
+        history: optional TaskHistory that every ingested board is recorded in.
+        """
         self.filename = filename
-        self.tasks: List[Task] = []
-    
+        self.compact = compact
+        self.history = history
+        self.tasks: List[Union[Task, CompactTask]] = []
+        self._by_id: Dict[str, Union[Task, CompactTask]] = {}
+        self._position: Dict[str, int] = {}
+        self._fingerprints: Dict[str, Tuple[Any, int]] = {}
+        self._by_motioner: Dict[str, Set[str]] = defaultdict(set)
+        self._by_illustrator: Dict[str, Set[str]] = defaultdict(set)
+        self._by_status: Dict[str, Set[str]] = defaultdict(set)
+        self._by_account: Dict[str, Set[str]] = defaultdict(set)
+        self._snapshot_lock = threading.Lock()
+        self._pending_snapshot = None
+        self._snapshot_thread: Optional[threading.Thread] = None
+
     def load_tasks(self) -> None:
         """Load tasks from a JSON file and parse them into Task objects."""
         with open(self.filename, "r", encoding="utf-8") as f:
             data = json.load(f)
             # assuming data is a list of tasks; if not, adjust accordingly
-            self.tasks = [Task(**task_dict) for task_dict in data]
-    
-    def filter_tasks_by_motioner(self, user_id: str) -> List[Task]:
-        """Return all tasks where at least one motioner has the given userId."""
-        return [
-            task for task in self.tasks
-            if any(motioner.userId == user_id for motioner in task.motioners)
-        ]
-    
-    
+            self._set_tasks([Task(**task_dict) for task_dict in data])
+
+    def load_payload(self, data: Union[List[dict], bytes, str]) -> None:
+        """
+        Load tasks straight from a get_tasks response, either already decoded
+        or as the raw response body, without going through a file. Raw bodies
+        are parsed and validated in one pass inside pydantic-core, unless a
+        history is attached and needs the decoded items too.
+        """
+        if isinstance(data, (bytes, str)):
+            if self.history:
+                data = from_json(data, cache_strings="keys")
+            else:
+                self._set_tasks(TASK_LIST.validate_json(data))
+                return
+        self._set_tasks(TASK_LIST.validate_python(data))
+        if self.history:
+            self.history.upsert(data)
+            self.history.mark_removed(self.history.board_ids() - self._by_id.keys())
+
+    def apply_payload(self, data: Union[List[dict], bytes, str], record: bool = True) -> List[TaskEvent]:
+        """
+        Ingest a new board as a delta against the current one. Items whose
+        fingerprint is unchanged since the last poll keep their existing task
+        object; only new or changed items are validated. Returns the changes
+        as TaskEvents, so callers react to churn instead of rescanning the board.
+        record=False skips writing to the history (used by restore()).
+        """
+        if isinstance(data, (bytes, str)):
+            data = from_json(data, cache_strings="keys")
+
+        first_board = not self._by_id
+        fingerprints = {}
+        changed = []
+        for item in data:
+            task_id = item["taskId"]
+            fingerprint = _fingerprint(item)
+            fingerprints[task_id] = fingerprint
+            if self._fingerprints.get(task_id) != fingerprint:
+                changed.append(item)
+
+        events = []
+        for task in self._convert(TASK_LIST.validate_python(changed)):
+            previous = self._by_id.get(task.taskId)
+            if previous is None:
+                events.append(TaskEvent("created", task))
+            else:
+                task_events = _diff(previous, task)
+                if not task_events:
+                    continue
+                events.extend(task_events)
+                self._unindex(previous)
+            self._by_id[task.taskId] = task
+            self._index(task)
+
+        removed_ids = self._by_id.keys() - fingerprints.keys()
+        for task_id in removed_ids:
+            removed = self._by_id.pop(task_id)
+            self._unindex(removed)
+            events.append(TaskEvent("removed", removed))
+
+        if self.history and record:
+            # Unchanged fingerprints are skipped in the database too, so this is usually a handful of rows.
+            self.history.upsert(changed)
+            if first_board:
+                # Catch up on tasks that left the board while nothing was polling.
+                removed_ids = self.history.board_ids() - fingerprints.keys()
+            self.history.mark_removed(removed_ids)
+
+        self._fingerprints = fingerprints
+        self.tasks = [self._by_id[task_id] for task_id in fingerprints]
+        self._position = {task_id: i for i, task_id in enumerate(fingerprints)}
+        return events
+
+    def restore(self) -> bool:
+        """Load the board last recorded in the history, e.g. at startup. Returns False if there is none."""
+        board = self.history.board() if self.history else []
+        if not board:
+            return False
+        self.apply_payload(board, record=False)
+        return True
+
+    def get(self, task_id: str) -> Optional[Union[Task, CompactTask]]:
+        return self._by_id.get(task_id)
+
+    def _convert(self, tasks: List[Task]) -> List[Union[Task, CompactTask]]:
+        return [CompactTask.from_task(task) for task in tasks] if self.compact else tasks
+
+    def _set_tasks(self, tasks: List[Task]) -> None:
+        """Replace the task list and rebuild the secondary indexes over it."""
+        self.tasks = self._convert(tasks)
+        self._by_id = {task.taskId: task for task in self.tasks}
+        self._position = {task.taskId: i for i, task in enumerate(self.tasks)}
+        # Without raw items there is nothing to fingerprint; the next apply_payload compares models instead.
+        self._fingerprints = {}
+        for index in (self._by_motioner, self._by_illustrator, self._by_status, self._by_account):
+            index.clear()
+        for task in self.tasks:
+            self._index(task)
+
+    def _index_keys(self, task):
+        return (
+            (self._by_motioner, _user_ids(task.motioners)),
+            (self._by_illustrator, _user_ids(task.illustrators)),
+            (self._by_status, (task.status,)),
+            (self._by_account, (task.accountId,)),
+        )
+
+    def _index(self, task) -> None:
+        for index, keys in self._index_keys(task):
+            for key in keys:
+                index[key].add(task.taskId)
+
+    def _unindex(self, task) -> None:
+        for index, keys in self._index_keys(task):
+            for key in keys:
+                index[key].discard(task.taskId)
+                if not index[key]:
+                    del index[key]
+
+    def save_snapshot(self, data: Any) -> None:
+        """Write the payload to self.filename as compact JSON, atomically. Raw bodies are written as is."""
+        tmp_name = f"{self.filename}.tmp"
+        if isinstance(data, bytes):
+            with open(tmp_name, "wb") as f:
+                f.write(data)
+        else:
+            with open(tmp_name, "w", encoding="utf-8") as f:
+                if isinstance(data, str):
+                    f.write(data)
+                else:
+                    json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_name, self.filename)
+
+    def save_snapshot_async(self, data: Any) -> None:
+        """
+        Save the snapshot on a background thread. If a write is still running,
+        only the newest payload is kept and written once it finishes.
+        """
+        if not self.filename:
+            return
+        with self._snapshot_lock:
+            self._pending_snapshot = data
+            if self._snapshot_thread and self._snapshot_thread.is_alive():
+                return
+            self._snapshot_thread = threading.Thread(target=self._snapshot_worker, daemon=True)
+            self._snapshot_thread.start()
+
+    def _snapshot_worker(self) -> None:
+        while True:
+            with self._snapshot_lock:
+                data, self._pending_snapshot = self._pending_snapshot, None
+                if data is None:
+                    self._snapshot_thread = None
+                    return
+            try:
+                self.save_snapshot(data)
+            except OSError as e:
+                print(f"⚠️ Snapshot write failed: {e}")
+
+    def flush(self) -> None:
+        """Wait for a pending background snapshot to be written."""
+        thread = self._snapshot_thread
+        if thread:
+            thread.join()
+
+    def query(self, motioner: Match = _ANY, illustrator: Match = _ANY, status: Match = _ANY,
+              account: Match = _ANY, by_priority: bool = False) -> List[Union[Task, CompactTask]]:
+        """
+        Return tasks matching every given criterion, answered from the indexes.
+        Each criterion takes one value or a collection of values, e.g.
+        query(motioner=user_id, status={"MOTION_TODO", "MOTION_IN_PROCESS"}, by_priority=True).
+        A criterion passed as None matches no task. Results are in board order, or highest priority first (board order on ties) with by_priority.
+        """
+        criteria = []
+        for index, wanted in ((self._by_motioner, motioner), (self._by_illustrator, illustrator),
+                              (self._by_status, status), (self._by_account, account)):
+            if wanted is _ANY:
+                continue
+            if wanted is None:
+                return []
+            if isinstance(wanted, str):
+                wanted = (wanted,)
+            buckets = [index[key] for key in wanted if key in index]
+            if not buckets:
+                return []
+            criteria.append(buckets)
+
+        if not criteria:
+            return sorted(self.tasks, key=lambda task: -task.priority) if by_priority else list(self.tasks)
+        # Start from the smallest criterion and narrow it bucket by bucket. A set & iterates the
+        # smaller side, so each step costs one lookup per remaining id however big the bucket is
+        # (a status bucket holds a large share of the board); no union of big buckets is built.
+        criteria.sort(key=lambda buckets: sum(map(len, buckets)))
+        first, rest = criteria[0], criteria[1:]
+        task_ids = first[0] if len(first) == 1 else set().union(*first)
+        for buckets in rest:
+            if len(buckets) == 1:
+                task_ids = task_ids & buckets[0]
+            else:
+                task_ids = set().union(*(task_ids & bucket for bucket in buckets))
+        tasks = [self._by_id[task_id] for task_id in task_ids]
+        if by_priority:
+            tasks.sort(key=lambda task: (-task.priority, self._position[task.taskId]))
+        else:
+            tasks.sort(key=lambda task: self._position[task.taskId])
+        return tasks
+
+    def filter_tasks_by_motioner(self, user_id: Optional[str]) -> List[Union[Task, CompactTask]]:
+        """Return all tasks where at least one motioner has the given userId (none for a None userId)."""
+        return self.query(motioner=user_id)
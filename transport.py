@@ -0,0 +1,182 @@
+# transport.py
+import os
+import time
+import threading
+from collections import Counter, deque
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Hosts kept in the pool manager, and keep-alive connections kept per host.
+POOL_HOSTS = int(os.getenv("HTTP_POOL_HOSTS", 16))
+POOL_PER_HOST = int(os.getenv("HTTP_POOL_PER_HOST", 10))
+# Connection errors and 5xx on idempotent requests are retried with exponential backoff.
+# 429 is left to the callers, which honour its Retry-After themselves.
+RETRIES = int(os.getenv("HTTP_RETRIES", 3))
+RETRY_BACKOFF = float(os.getenv("HTTP_RETRY_BACKOFF", 0.5))
+RETRY_STATUSES = (500, 502, 503, 504)
+DRIVE_TIMEOUT = 60
+
+
+class ConnectionStats:
+    """
+    Requests and new connections (each a TCP and, for https, TLS handshake)
+    per host, read from urllib3's pool counters, plus recent response times.
+    """
+
+    def __init__(self, latency_window: int = 4096):
+        self._lock = threading.Lock()
+        self._retired_requests = Counter()
+        self._retired_connections = Counter()
+        self._latencies = deque(maxlen=latency_window)
+        self._adapter: Optional[HTTPAdapter] = None
+
+    def retire(self, pool) -> None:
+        """Keep the counters of a pool the pool manager is evicting."""
+        with self._lock:
+            self._retired_requests[pool.host] += pool.num_requests
+            self._retired_connections[pool.host] += pool.num_connections
+
+    def record_latency(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def per_host(self) -> Dict[str, tuple]:
+        """{host: (requests, connections)} over the life of the process."""
+        requests_by_host = Counter(self._retired_requests)
+        connections_by_host = Counter(self._retired_connections)
+        pools = self._adapter.poolmanager.pools if self._adapter else {}
+        for key in pools.keys():
+            try:
+                pool = pools[key]
+            except KeyError:  # evicted meanwhile, and counted by retire()
+                continue
+            requests_by_host[pool.host] += pool.num_requests
+            connections_by_host[pool.host] += pool.num_connections
+        return {host: (requests_by_host[host], connections_by_host[host]) for host in requests_by_host}
+
+    @property
+    def requests(self) -> int:
+        return sum(count for count, _ in self.per_host().values())
+
+    @property
+    def handshakes(self) -> int:
+        return sum(count for _, count in self.per_host().values())
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Share of requests served on an already open connection."""
+        total, handshakes = 0, 0
+        for count, connections in self.per_host().values():
+            total += count
+            handshakes += connections
+        return 1 - handshakes / total if total else 0.0
+
+    def latency_percentile(self, percentile: float) -> float:
+        with self._lock:
+            latencies = sorted(self._latencies)
+        return latencies[min(int(len(latencies) * percentile), len(latencies) - 1)] if latencies else 0.0
+
+    def summary(self) -> str:
+        return (f"http {self.requests} requests, {self.handshakes} handshakes, "
+                f"{self.reuse_ratio:.0%} reused, p95 {self.latency_percentile(0.95) * 1000:.0f} ms")
+
+
+stats = ConnectionStats()
+
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter whose evicted pools still count towards stats."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pools.dispose_func = self._dispose
+
+    @staticmethod
+    def _dispose(pool):
+        stats.retire(pool)
+        pool.close()
+
+
+_adapter: Optional[PooledAdapter] = None
+_adapter_lock = threading.Lock()
+
+
+def shared_adapter() -> PooledAdapter:
+    """The process-wide connection pools every session in the app is mounted on."""
+    global _adapter
+    with _adapter_lock:
+        if _adapter is None:
+            retry = Retry(total=RETRIES, backoff_factor=RETRY_BACKOFF, status_forcelist=RETRY_STATUSES,
+                          raise_on_status=False)
+            _adapter = PooledAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_PER_HOST, max_retries=retry)
+            stats._adapter = _adapter
+        return _adapter
+
+
+def _record_latency(response, *args, **kwargs):
+    stats.record_latency(response.elapsed.total_seconds())
+
+
+def new_session() -> requests.Session:
+    """
+    A session with its own cookies and headers whose connections come from
+    the shared pools. Don't close it: closing a session closes its adapters.
+    """
+    session = requests.Session()
+    adapter = shared_adapter()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    session.hooks["response"].append(_record_latency)
+    return session
+
+
+def retry_after(response) -> Optional[float]:
+    """Seconds to wait from a Retry-After header, given either as seconds or as an HTTP date."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class RequestsHttp:
+    """
+    httplib2.Http look-alike over a pooled session, so googleapiclient (and
+    google_auth_httplib2.AuthorizedHttp) share the app's connection pools.
+    Unlike httplib2.Http it is safe to use from several threads.
+    """
+
+    def __init__(self, session: Optional[requests.Session] = None, timeout: float = DRIVE_TIMEOUT):
+        self.session = session or new_session()
+        self.timeout = timeout
+
+    def request(self, uri, method="GET", body=None, headers=None, redirections=5, connection_type=None, **kwargs):
+        # httplib2 is only needed once Drive is used.
+        import httplib2
+
+        response = self.session.request(method, uri, data=body, headers=headers, timeout=self.timeout,
+                                        allow_redirects=redirections > 0)
+        info = {key.lower(): value for key, value in response.headers.items()}
+        if info.pop("content-encoding", None):
+            # requests has already decoded gzip, as httplib2 would have.
+            info["content-length"] = str(len(response.content))
+        info["status"] = str(response.status_code)
+        result = httplib2.Response(info)
+        result.reason = response.reason
+        return result, response.content
+
+    def close(self):
+        pass
@@ -1,8 +1,8 @@
 #old.client.py
 import os
 import pickle
-import requests
 from dotenv import load_dotenv
+from transport import new_session, retry_after
 
 load_dotenv()  # Load environment variables from .env
 
@@ -13,8 +13,12 @@ COOKIES_FILE = "cookies.pkl"
 
 class AdbrazeClient:
     def __init__(self):
-        self.session = requests.Session()
+        self.session = new_session()
         self.etag = None
+        # Outcome of the last get_tasks call, for the poll scheduler.
+        self.last_status = None
+        self.last_bytes = 0
+        self.retry_after = None
         self.email = os.getenv("EMAIL")
         self.password = os.getenv("PASSWORD")
         self.load_cookies()
@@ -77,7 +81,19 @@ class AdbrazeClient:
         print(f"❌ Refresh failed: {response.status_code}, {response.text}")
         return False
 
-    def get_tasks(self):
+    def close(self):
+        """Nothing to stop; the session's connections belong to the shared pools."""
+
+    def _record(self, response):
+        self.last_status = response.status_code
+        self.last_bytes += int(response.headers.get("Content-Length") or len(response.content))
+        self.retry_after = retry_after(response)
+
+    def get_tasks(self, raw=False):
+        """The task board, or None if it is unchanged or can't be fetched. With raw=True the undecoded body is returned."""
+        self.last_status = None
+        self.last_bytes = 0
+        self.retry_after = None
         auth_token = self.session.cookies.get("AuthenticationToken")
         headers = {
             "Authorization": f"Bearer {auth_token}",
@@ -90,17 +106,20 @@ class AdbrazeClient:
             headers["If-None-Match"] = self.etag
 
         response = self.session.get(TASKS_URL, headers=headers)
+        self._record(response)
         # Handle token expiry
         if response.status_code == 401:
             print("🚸 Authentication token expired. Attempting refresh...")
             if self.refresh_token():
                 headers["Authorization"] = f"Bearer {self.session.cookies.get('AuthenticationToken')}"
                 response = self.session.get(TASKS_URL, headers=headers)
+                self._record(response)
             else:
                 print("🚸 Refresh failed. Logging in again...")
                 if self.login():
                     headers["Authorization"] = f"Bearer {self.session.cookies.get('AuthenticationToken')}"
                     response = self.session.get(TASKS_URL, headers=headers)
+                    self._record(response)
         if response.status_code == 304:
             print("ℹ️ No changes in tasks since last fetch.")
             return None
@@ -109,7 +128,7 @@ class AdbrazeClient:
                 self.etag = response.headers["ETag"]
 
             print("✅ Successfully retrieved tasks!")
-            return response.json()
+            return response.content if raw else response.json()
         else:
             print(f"❌ Failed to fetch tasks: {response.status_code}, {response.text}")
             return None
\ No newline at end of file
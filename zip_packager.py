@@ -0,0 +1,89 @@
+# zip_packager.py
+import os
+import threading
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+# Formats that are already compressed; deflating them again only burns CPU.
+STORED_EXTENSIONS = {
+    ".mp4", ".mov", ".m4v", ".webm", ".mkv", ".avi",
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".heic",
+    ".mp3", ".aac", ".m4a", ".ogg",
+    ".zip", ".rar", ".7z", ".gz",
+}
+# A file whose first block doesn't shrink when deflated is stored instead.
+SAMPLE_BLOCK = 64 * 1024
+
+
+class ZipPackager:
+    """
+    Build `<folder>.zip` while files are still arriving.
+
+    add(path) hands a file to a thread pool, so packaging keeps pace with the
+    downloads that feed it. Already-compressed media, and files whose first
+    block doesn't shrink when deflated, are stored as is; everything else is
+    deflated. Entries are written with ZipFile.write under a lock. close()
+    waits for outstanding entries, writes the central directory and, with
+    verify, checks every entry's CRC with testzip.
+    """
+
+    def __init__(self, folder_path: str, workers: int = None, compresslevel: int = 6, verify: bool = True):
+        self.folder_path = folder_path
+        self.zip_name = f"{folder_path}.zip"
+        self.compresslevel = compresslevel
+        self.verify = verify
+        self._zip = zipfile.ZipFile(self.zip_name, "w", zipfile.ZIP_DEFLATED, compresslevel=compresslevel)
+        self._pool = ThreadPoolExecutor(max_workers=workers or os.cpu_count())
+        self._write_lock = threading.Lock()
+        self._futures = []
+        self._added = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add(self, file_path: str) -> None:
+        """Queue a file from inside the folder for packaging; repeated paths are ignored."""
+        arcname = os.path.relpath(file_path, start=os.path.dirname(self.folder_path))
+        if arcname in self._added:
+            return
+        self._added.add(arcname)
+        self._futures.append(self._pool.submit(self._add_entry, file_path, arcname))
+
+    def close(self) -> str:
+        self._pool.shutdown(wait=True)
+        for future in self._futures:
+            future.result()
+        self._zip.close()
+        if self.verify:
+            self.check()
+        print(f"📦 Folder zipped: {self.zip_name}")
+        return self.zip_name
+
+    def check(self) -> None:
+        """Re-read the finished archive and raise BadZipFile if an entry fails its CRC check."""
+        with zipfile.ZipFile(self.zip_name) as zf:
+            bad = zf.testzip()
+        if bad is not None:
+            raise zipfile.BadZipFile(f"{bad} is corrupt in {self.zip_name}")
+
+    def _add_entry(self, file_path, arcname):
+        try:
+            compress_type = zipfile.ZIP_STORED if self._incompressible(file_path) else zipfile.ZIP_DEFLATED
+            with self._write_lock:
+                self._zip.write(file_path, arcname, compress_type=compress_type)
+        except OSError as e:
+            print(f"❌ Could not add {arcname} to zip: {e}")
+
+    def _incompressible(self, file_path) -> bool:
+        if os.path.splitext(file_path)[1].lower() in STORED_EXTENSIONS:
+            return True
+        with open(file_path, "rb") as f:
+            sample = f.read(SAMPLE_BLOCK)
+        if not sample:
+            return False
+        compressor = zlib.compressobj(self.compresslevel, zlib.DEFLATED, -15)
+        return len(compressor.compress(sample)) + len(compressor.flush()) >= len(sample)